@@ -0,0 +1,81 @@
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, Iterator, List, Tuple
+
+# Startup benchmark for `rr import-time` (dev tooling: not part of the Lambda asset).
+# Each target runs in a fresh interpreter with -X importtime, from an empty cwd,
+# with AWS_LAMBDA_FUNCTION_NAME set so storage would pick DynamoDB as on Lambda.
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+TARGETS = {
+    "ingest": ["-c", "import src.ingest.handler"],
+    "rr --help": ["-m", "cli.rr", "--help"],
+}
+
+# Modules a target must not import just to start
+HEAVY_MODULES = {
+    "ingest": ("boto3", "botocore", "rich", "yaml"),
+    "rr --help": ("boto3", "botocore", "rich", "yaml", "pydantic", "src.shared.storage"),
+}
+
+# Ceilings on summed import time, checked by `rr import-time` only: wall-clock numbers
+# are too noisy for unit tests, which check the deterministic module and file guards
+BUDGET_MS = {
+    "ingest": 600,
+    "rr --help": 250,
+}
+
+def _entries(stderr: str) -> Iterator[Tuple[str, float, bool]]:
+    """(module, cumulative ms, is top-level) for each -X importtime line."""
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # name is " " + two spaces per nesting level
+        yield name.strip(), int(cumulative) / 1000, not name.startswith("  ")
+
+def _parse(stderr: str) -> Dict[str, float]:
+    """Cumulative import time (ms) per module."""
+    modules: Dict[str, float] = {}
+    for name, ms, _ in _entries(stderr):
+        modules[name] = modules.get(name, 0) + ms
+    return modules
+
+def _top_level(stderr: str) -> float:
+    # Top-level entries sum to the total; nested ones are already included in them
+    return sum(ms for _, ms, top in _entries(stderr) if top)
+
+def measure(target: str, runs: int = 3, top: int = 5) -> Dict[str, Any]:
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT, AWS_LAMBDA_FUNCTION_NAME="rr-import-time")
+    env.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+    import_ms: List[float] = []
+    wall_ms: List[float] = []
+    with tempfile.TemporaryDirectory() as cwd:
+        for _ in range(runs):
+            start = time.perf_counter()
+            proc = subprocess.run([sys.executable, "-X", "importtime", *TARGETS[target]],
+                                  cwd=cwd, env=env, capture_output=True, text=True)
+            wall_ms.append((time.perf_counter() - start) * 1000)
+            if proc.returncode != 0:
+                raise RuntimeError(f"{target} failed to start:\n{proc.stderr[-2000:]}")
+            import_ms.append(_top_level(proc.stderr))
+        side_effects = sorted(os.listdir(cwd))
+    modules = _parse(proc.stderr)
+    heavy = [m for m in modules if m.split(".")[0] in HEAVY_MODULES[target] or m in HEAVY_MODULES[target]]
+    return {
+        "target": target,
+        "import_ms": round(statistics.median(import_ms), 1),
+        "wall_ms": round(statistics.median(wall_ms), 1),
+        "budget_ms": BUDGET_MS[target],
+        "modules": len(modules),
+        "heavy_imports": sorted(heavy),
+        "files_created": side_effects,
+        "top": [(m, round(ms, 1)) for m, ms in sorted(modules.items(), key=lambda kv: -kv[1])[:top]],
+    }
+
+def run_all(runs: int = 3) -> List[Dict[str, Any]]:
+    return [measure(target, runs=runs) for target in TARGETS]
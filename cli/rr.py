@@ -2,42 +2,197 @@ import click
 import json
 import os
 import sys
-from rich.console import Console
-from rich.table import Table
 
 # Add project root to path
 sys.path.append(os.getcwd())
 
-from src.shared.storage import db
-from src.shared.models import Incident
+from src.shared.lazy import LazyObject
 
-console = Console()
+# rich, storage (pydantic) and the pipeline load inside the commands that use them,
+# so `rr --help` and light commands start fast
+def _make_console():
+    from rich.console import Console
+    return Console()
+
+console = LazyObject(_make_console)
 
 @click.group()
 def cli():
     """Runbook Ranger CLI - Local Simulator"""
     pass
 
+def _start_profile(enabled):
+    if enabled:
+        from src.shared.profiling import profiler
+        profiler.start()
+
+def _report_profile(enabled, out_dir, top=10):
+    """Prints the per-stage hot-path tables and writes pstats/collapsed stacks"""
+    if not enabled:
+        return
+    from rich.table import Table
+    from src.shared.profiling import profiler
+    profiler.stop()
+    for stage, report in profiler.summary(top=top).items():
+        table = Table(title=f"Stage: {stage} ({report['total_seconds'] * 1000:.2f} ms self time)")
+        table.add_column("Function", style="cyan")
+        table.add_column("Calls", justify="right")
+        table.add_column("Self (ms)", justify="right")
+        table.add_column("Cumulative (ms)", justify="right")
+        for row in report["top"]:
+            table.add_row(row["function"], str(row["calls"]),
+                          f"{row['tottime'] * 1000:.3f}", f"{row['cumtime'] * 1000:.3f}")
+        console.print(table)
+    paths = profiler.write(out_dir)
+    console.print(f"Profiles written to {out_dir} (flamegraph input: {paths['collapsed']})")
+
 @cli.command()
 @click.argument('alarm_file', type=click.Path(exists=True))
-def simulate(alarm_file):
-    """Simulate an incident from a JSON alarm file"""
+@click.option('--profile', is_flag=True, help='Profile each pipeline stage with cProfile')
+@click.option('--profile-out', default='.rr_profile', show_default=True, help='Directory for profile output')
+@click.option('--shards', type=int, default=None, help='Replay a .jsonl file through N worker processes (sharded by resource)')
+@click.option('--auto-approve', is_flag=True, help='With --shards: execute plans that require approval instead of pausing')
+@click.option('--db', 'db_path', default=os.path.join('.rr_db', 'ranger.sqlite'), show_default=True, help='With --shards: shared SQLite store')
+def simulate(alarm_file, profile, profile_out, shards, auto_approve, db_path):
+    """Simulate an incident from a JSON alarm file (or replay a .jsonl file of alarms)"""
+    if shards:
+        from src.simulation.sharded import run_sharded
+        console.print(f"[bold blue]Replaying {alarm_file} across {shards} shards...[/bold blue]")
+        with open(alarm_file, 'r') as f:
+            report = run_sharded(f, shards=shards, db_path=db_path, auto_approve=auto_approve)
+        console.print_json(json.dumps(report))
+        console.print(f"Inspect with: RR_STORAGE=sqlite RR_DB_PATH={db_path} python3 -m cli.rr list-incidents")
+        return
+
     console.print(f"[bold blue]Simulating incident from {alarm_file}...[/bold blue]")
     try:
         with open(alarm_file, 'r') as f:
-            alarm_event = json.load(f)
+            if alarm_file.endswith(".jsonl"):
+                alarm_events = [json.loads(line) for line in f if line.strip()]
+            else:
+                alarm_events = [json.load(f)]
         
         from src.simulation.orchestrator import orchestrator
-        orchestrator.process_event(alarm_event)
+        _start_profile(profile)
+        try:
+            for alarm_event in alarm_events:
+                orchestrator.process_event(alarm_event)
+        finally:
+            # A failing incident is the one worth profiling: report whatever ran
+            _report_profile(profile, profile_out)
         
     except Exception as e:
         console.print(f"[red]Error:[/red] {e}")
         import traceback
         traceback.print_exc()
 
+@cli.command()
+@click.option('--days', type=float, default=None, help='Simulated days of alarm traffic')
+@click.option('--rate', type=float, default=None, help='Incidents per day')
+@click.option('--seed', type=int, default=None, help='Random seed')
+@click.option('--config', 'config_file', type=click.Path(exists=True), help='JSON file with SimConfig overrides')
+@click.option('--json', 'as_json', is_flag=True, help='Print raw JSON results')
+@click.option('--profile', is_flag=True, help='Profile each pipeline stage with cProfile')
+@click.option('--profile-out', default='.rr_profile', show_default=True, help='Directory for profile output')
+def bench(days, rate, seed, config_file, as_json, profile, profile_out):
+    """Virtual-time MTTR benchmark: manual baseline vs Runbook Ranger"""
+    from src.simulation.des import SimConfig, run_benchmark
+
+    overrides = {}
+    if config_file:
+        with open(config_file, 'r') as f:
+            overrides = json.load(f)
+    for key, value in (("days", days), ("incidents_per_day", rate), ("seed", seed)):
+        if value is not None:
+            overrides[key] = value
+    _start_profile(profile)
+    results = run_benchmark(SimConfig(**overrides))
+    _report_profile(profile, profile_out)
+
+    if as_json:
+        click.echo(json.dumps(results, indent=2))
+        return
+
+    from rich.table import Table
+    manual, ranger = results["manual"], results["ranger"]
+    table = Table(title=f"Simulated {manual['incidents']} incidents")
+    table.add_column("Metric", style="cyan")
+    table.add_column("Baseline (Manual)")
+    table.add_column("Runbook Ranger", style="green")
+    for key, label in [
+        ("mttr_min", "MTTR (avg, min)"),
+        ("ttr_p50_min", "TTR p50 (min)"),
+        ("ttr_p90_min", "TTR p90 (min)"),
+        ("ttr_p99_min", "TTR p99 (min)"),
+        ("automated_pct", "Resolved without paging (%)"),
+        ("operator_min_per_incident", "Operator time (min/incident)"),
+        ("events", "Simulated events"),
+        ("wall_seconds", "Wall time (s)"),
+    ]:
+        table.add_row(label, str(manual[key]), str(ranger[key]))
+    console.print(table)
+
+@cli.command('import-time')
+@click.option('--runs', type=int, default=3, show_default=True, help='Fresh interpreters per target (median is reported)')
+@click.option('--json', 'as_json', is_flag=True, help='Print raw JSON results')
+def import_time(runs, as_json):
+    """Startup benchmark: -X importtime for the ingest handler and `rr --help`"""
+    from cli.import_time import run_all
+    results = run_all(runs=runs)
+    if as_json:
+        click.echo(json.dumps(results, indent=2))
+    else:
+        from rich.table import Table
+        table = Table(title="Startup (median)")
+        table.add_column("Target", style="cyan")
+        table.add_column("Imports (ms)", justify="right")
+        table.add_column("Budget (ms)", justify="right")
+        table.add_column("Wall (ms)", justify="right")
+        table.add_column("Heavy imports", style="red")
+        for r in results:
+            table.add_row(r["target"], str(r["import_ms"]), str(r["budget_ms"]), str(r["wall_ms"]),
+                          ", ".join(r["heavy_imports"]) or "-")
+        console.print(table)
+    if any(r["heavy_imports"] or r["files_created"] or r["import_ms"] > r["budget_ms"] for r in results):
+        sys.exit(1)
+
+BUCKETS = {"hour": 3600, "day": 86400}
+
+def _bucket_seconds(ctx, param, value):
+    """--bucket: hour, day or a positive number of seconds"""
+    if value in BUCKETS:
+        return BUCKETS[value]
+    try:
+        seconds = int(value)
+    except ValueError:
+        seconds = 0
+    if seconds <= 0:
+        raise click.BadParameter(f"{value!r} is not hour, day or a positive number of seconds")
+    return seconds
+
+@cli.command()
+@click.option('--runbook', help='Only incidents handled by this runbook')
+@click.option('--since', help='Only incidents created at/after this ISO-8601 time')
+@click.option('--until', help='Only incidents created before this ISO-8601 time')
+@click.option('--bucket', 'bucket_seconds', default='hour', show_default=True, callback=_bucket_seconds,
+              help='Incident rate bucket: hour, day or seconds')
+@click.option('--parquet', 'parquet_dir', type=click.Path(), help='Also export columns as Parquet to this directory')
+def stats(runbook, since, until, bucket_seconds, parquet_dir):
+    """MTTR, success rates and action latencies as JSON"""
+    from src.analytics.stats import StatsFrame
+    from src.shared.storage import db
+
+    frame = StatsFrame.from_storage(db)
+    result = frame.compute(runbook=runbook, since=since, until=until, bucket_seconds=bucket_seconds)
+    if parquet_dir:
+        result["parquet"] = frame.to_parquet(parquet_dir)
+    click.echo(json.dumps(result, indent=2))
+
 @cli.command()
 def list_incidents():
     """List all local incidents"""
+    from rich.table import Table
+    from src.shared.storage import db
     incidents = db.list_incidents()
     table = Table(title="Local Incidents")
     table.add_column("ID", style="cyan", no_wrap=True)
@@ -52,8 +207,10 @@ def list_incidents():
 
 @cli.command()
 @click.argument('incident_id')
-def show(incident_id):
+@click.option('--raw', is_flag=True, help='Also print the raw CloudWatch event')
+def show(incident_id, raw):
     """Show details for a specific incident"""
+    from src.shared.storage import db
     incident = db.get_incident(incident_id)
     if not incident:
         console.print(f"[red]Incident {incident_id} not found[/red]")
@@ -63,6 +220,9 @@ def show(incident_id):
     console.print(f"[bold]State:[/bold] {incident.state.value}")
     console.print(f"[bold]Alarm:[/bold] {incident.alarm_name}")
     console.print(f"[bold]Summary:[/bold] {incident.summary}")
+    if raw:
+        console.print("\n[bold]CloudWatch Event:[/bold]")
+        console.print_json(data=db.get_event(incident))
     
     plan = db.get_plan(incident_id)
     if plan:
@@ -71,10 +231,51 @@ def show(incident_id):
         for action in plan.actions:
             console.print(f"- {action['id']} ({action['type']})")
 
+@cli.command()
+@click.argument('target')
+@click.option('--dry-run', is_flag=True, help='TARGET is a JSONL corpus of alarm events; plan them all without touching storage')
+@click.option('--runbooks', 'runbooks_dir', type=click.Path(exists=True, file_okay=False), help='Runbook directory (default: ./runbooks)')
+@click.option('--compare', 'compare_dir', type=click.Path(exists=True, file_okay=False), help='Diff plans against this (baseline) runbook directory')
+@click.option('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+@click.option('--samples', type=int, default=5, show_default=True, help='Example diffs/unresolved references to include')
+def plan(target, dry_run, runbooks_dir, compare_dir, workers, samples):
+    """Plan an incident by id, or batch dry-run a corpus of alarms (--dry-run)"""
+    if not dry_run:
+        from src.planner.handler import handler_manual_trigger
+        result = handler_manual_trigger(target)
+        if result:
+            console.print_json(result.model_dump_json())
+        return
+
+    if not os.path.isfile(target):
+        raise click.BadParameter(f"{target} is not a file", param_hint='TARGET')
+    from src.planner.dry_run import dry_run as run_dry_run
+    report = run_dry_run(target, runbooks_dir=runbooks_dir, compare_dir=compare_dir,
+                         workers=workers, samples=samples)
+    console.print_json(json.dumps(report))
+
+@cli.command('compile-runbooks')
+@click.option('--runbooks', 'runbooks_dir', type=click.Path(exists=True, file_okay=False), help='Runbook directory (default: ./runbooks)')
+@click.option('--out', default=os.path.join('src', 'runbooks.bundle.json'), show_default=True, help='Bundle output path (shipped with the Lambda code)')
+def compile_runbooks(runbooks_dir, out):
+    """Validate all runbooks and write the precompiled bundle the Lambdas load"""
+    from src.planner.bundle import build_bundle, write_bundle
+    try:
+        data, warnings = build_bundle(runbooks_dir)
+    except ValueError as e:
+        console.print(f"[red]{e}[/red]")
+        sys.exit(1)
+    for w in warnings:
+        console.print(f"[yellow]Warning:[/yellow] {w}")
+    write_bundle(data, out)
+    console.print(f"[green]Compiled {len(data['runbooks'])} runbooks -> {out} (version {data['version']})[/green]")
+
 @cli.command()
 @click.argument('incident_id')
-def approve(incident_id):
+@click.option('--force', is_flag=True, help='Re-run an incident stuck in EXECUTING (even within its claim lease) or FAILED')
+def approve(incident_id, force):
     """Approve a pending plan for an incident"""
+    from src.shared.storage import db
     incident = db.get_incident(incident_id)
     if not incident:
         console.print(f"[red]Incident {incident_id} not found[/red]")
@@ -91,7 +292,7 @@ def approve(incident_id):
     
     console.print(f"[green]Approving Incident {incident_id}...[/green]")
     from src.simulation.orchestrator import orchestrator
-    orchestrator.resume_approval(incident_id)
+    orchestrator.resume_approval(incident_id, force=force)
 
 if __name__ == '__main__':
     cli()
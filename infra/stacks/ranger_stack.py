@@ -1,3 +1,4 @@
+import os
 from aws_cdk import (
     Stack,
     RemovalPolicy,
@@ -12,6 +13,9 @@ from aws_cdk import (
 )
 from constructs import Construct
 
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+RUNBOOK_BUNDLE = "runbooks.bundle.json"  # relative to src/, the Lambda asset root
+
 class RunbookRangerStack(Stack):
 
     def __init__(self, scope: Construct, construct_id: str, **kwargs) -> None:
@@ -47,6 +51,23 @@ class RunbookRangerStack(Stack):
             removal_policy=RemovalPolicy.DESTROY
         )
 
+        # Event Blobs Table (raw CloudWatch payloads, compressed, keyed by content hash)
+        self.event_blobs_table = ddb.Table(
+            self, "EventBlobsTable",
+            partition_key=ddb.Attribute(name="event_hash", type=ddb.AttributeType.STRING),
+            billing_mode=ddb.BillingMode.PAY_PER_REQUEST,
+            removal_policy=RemovalPolicy.DESTROY
+        )
+
+        # Counters Table (blast-radius limits: per-incident counts and sliding windows)
+        self.counters_table = ddb.Table(
+            self, "CountersTable",
+            partition_key=ddb.Attribute(name="counter_key", type=ddb.AttributeType.STRING),
+            time_to_live_attribute="expires_at",
+            billing_mode=ddb.BillingMode.PAY_PER_REQUEST,
+            removal_policy=RemovalPolicy.DESTROY
+        )
+
         # Locks Table
         self.locks_table = ddb.Table(
             self, "LocksTable",
@@ -62,12 +83,21 @@ class RunbookRangerStack(Stack):
         
         # Shared Layer (for dependencies if needed, or just bundle code)
         # For simplicity in this demo, we'll assume code is bundled or small enough via Code.from_asset
+
+        # Runbooks ship precompiled inside the src asset. cdk.json's build step compiles
+        # (and validates) them before synth, so a broken runbook fails the deploy
+        bundle = os.path.join(REPO_ROOT, "src", RUNBOOK_BUNDLE)
+        if not os.path.exists(bundle):
+            raise RuntimeError(f"{bundle} is missing: run `python3 -m cli.rr compile-runbooks` "
+                               "from the repo root (cdk synth/deploy does this via cdk.json's build step)")
         
         common_env = {
             "TABLE_INCIDENTS": self.incidents_table.table_name,
             "TABLE_PLANS": self.plans_table.table_name,
             "TABLE_ACTIONS": self.action_logs_table.table_name,
+            "TABLE_EVENTS": self.event_blobs_table.table_name,
             "TABLE_LOCKS": self.locks_table.table_name,
+            "TABLE_COUNTERS": self.counters_table.table_name,
         }
 
         # Ingest Lambda
@@ -80,6 +110,7 @@ class RunbookRangerStack(Stack):
             timeout=Duration.seconds(10)
         )
         self.incidents_table.grant_write_data(self.ingest_lambda)
+        self.event_blobs_table.grant_write_data(self.ingest_lambda)
 
         # Planner Lambda
         self.planner_lambda = _lambda.Function(
@@ -87,11 +118,12 @@ class RunbookRangerStack(Stack):
             runtime=_lambda.Runtime.PYTHON_3_12,
             handler="planner.handler.handler_manual_trigger", # Adapted entrypoint
             code=_lambda.Code.from_asset("../src"),
-            environment=common_env,
+            environment={**common_env, "RUNBOOK_BUNDLE": RUNBOOK_BUNDLE},
             timeout=Duration.seconds(30)
         )
-        self.incidents_table.grant_read_data(self.planner_lambda)
+        self.incidents_table.grant_read_write_data(self.planner_lambda)  # plan + MITIGATING commit together
         self.plans_table.grant_write_data(self.planner_lambda)
+        self.event_blobs_table.grant_read_data(self.planner_lambda)
         
         # Executor Lambda
         self.executor_lambda = _lambda.Function(
@@ -100,12 +132,15 @@ class RunbookRangerStack(Stack):
             handler="executor.handler.lambda_handler", # Needs wrapper
             code=_lambda.Code.from_asset("../src"),
             environment=common_env,
+            # Bounds SSM_COMMAND_TIMEOUT_SECONDS (src/actions/ssm.py) and is well under the
+            # executor's claim lease (EXECUTION_LEASE_SECONDS in src/executor/handler.py)
             timeout=Duration.seconds(60)
         )
         self.incidents_table.grant_read_write_data(self.executor_lambda)
         self.plans_table.grant_read_data(self.executor_lambda)
         self.action_logs_table.grant_write_data(self.executor_lambda)
         self.locks_table.grant_read_write_data(self.executor_lambda)
+        self.counters_table.grant_read_write_data(self.executor_lambda)
 
         # Add Safety/Remediation IAM policies to Executor
         # Least Privilege: Only allow specific actions on specific resources if possible
@@ -124,6 +159,12 @@ class RunbookRangerStack(Stack):
             resources=["*"], # Requires strict tagging
             conditions={"StringEquals": {"aws:ResourceTag/allow-remediation": "true"}}
         ))
+        # Fan-out actions: polling SSM invocations and resolving `targets` tag selectors.
+        # Neither API supports resource-level permissions
+        self.executor_lambda.add_to_role_policy(iam.PolicyStatement(
+            actions=["ssm:ListCommandInvocations", "tag:GetResources"],
+            resources=["*"]
+        ))
 
         # =================================================================
         # 3. Workflow (Step Functions)
@@ -0,0 +1,20 @@
+from src.shared.aws_mock import mock_boto3
+
+def scale_asg(params):
+    asg_name = params.get("asg_name")
+    adjustment = int(params.get("adjustment", 1))
+    
+    client = mock_boto3.client("autoscaling")
+    # 1. Get current capacity
+    res = client.describe_auto_scaling_groups([asg_name])
+    asgs = res.get("AutoScalingGroups", [])
+    if not asgs:
+        raise ValueError(f"ASG {asg_name} not found")
+        
+    current = asgs[0]["DesiredCapacity"]
+    new_capacity = current + adjustment
+    
+    # 2. Set new capacity
+    print(f"  -> scale_asg: {asg_name} {current} -> {new_capacity}")
+    client.set_desired_capacity(asg_name, new_capacity)
+    return {"old": current, "new": new_capacity}
@@ -0,0 +1,48 @@
+from typing import Any, Dict, List
+from src.shared.aws_mock import mock_boto3
+
+# Upper bound on chunks/services dispatched at once, regardless of max_concurrency
+MAX_PARALLEL_CHUNKS = 8
+
+def as_list(value) -> List[str]:
+    """Accepts a single id, a comma separated string or a list of ids."""
+    if not value:
+        return []
+    if isinstance(value, str):
+        return [v.strip() for v in value.split(",") if v.strip()]
+    return [str(v) for v in value]
+
+def chunks(items: List[Any], size: int) -> List[List[Any]]:
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+def concurrency_limit(value, total: int) -> int:
+    """
+    Resolves a rolling-restart cap into an absolute number of targets.
+    Accepts an absolute count ("10") or a percentage of the fleet ("25%"), like SSM MaxConcurrency.
+    """
+    if value is None or value == "":
+        return max(1, total)
+    value = str(value).strip()
+    if value.endswith("%"):
+        return max(1, total * int(value[:-1]) // 100)
+    return max(1, int(value))
+
+def resolve_tag_selector(resource_type: str, selector: Dict[str, Any]) -> List[str]:
+    """
+    Resolves a tag selector such as {"Role": "web"} to resource ARNs in bulk,
+    using the Resource Groups Tagging API (one paginated call instead of one per resource).
+    """
+    tag_filters = [{"Key": k, "Values": as_list(v)} for k, v in selector.items()]
+    client = mock_boto3.client("resourcegroupstaggingapi")
+    arns: List[str] = []
+    token = ""
+    while True:
+        res = client.get_resources(
+            TagFilters=tag_filters,
+            ResourceTypeFilters=[resource_type],
+            PaginationToken=token
+        )
+        arns.extend(r["ResourceARN"] for r in res.get("ResourceTagMappingList", []))
+        token = res.get("PaginationToken", "")
+        if not token:
+            return arns
@@ -0,0 +1,7 @@
+def rollback_deployment(params):
+    # Supports ECS or Lambda based on params
+    target_type = params.get("target_type") # ecs | lambda
+    target_id = params.get("target_id")
+    
+    print(f"  -> rollback_deployment: Rolling back {target_type} {target_id}")
+    return {"status": "rolled_back", "previous_version": "v1"}
@@ -0,0 +1,85 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+from src.shared.aws_mock import mock_boto3
+from src.actions.common import MAX_PARALLEL_CHUNKS, as_list, chunks, concurrency_limit, resolve_tag_selector
+
+# DescribeServices accepts at most 10 services per call
+ECS_MAX_SERVICES_PER_DESCRIBE = 10
+
+def _parse_service_arn(arn: str) -> Optional[Tuple[Optional[str], str]]:
+    """
+    (cluster, service) from arn:aws:ecs:<region>:<account>:service/<cluster>/<service>.
+    Old-format ARNs (service/<service>) carry no cluster: (None, service).
+    None if `arn` is not an ECS service ARN.
+    """
+    parts = arn.split(":", 5)
+    if len(parts) != 6 or not parts[5].startswith("service/"):
+        return None
+    path = parts[5][len("service/"):].split("/")
+    if len(path) == 1 and path[0]:
+        return None, path[0]
+    if len(path) == 2 and all(path):
+        return path[0], path[1]
+    return None
+
+def scale_ecs_service(params):
+    """
+    Scales one or many services of a cluster.
+    Targets: service, services (list) and/or targets (tag selector).
+    Every service is attempted; one that cannot be resolved or scaled is reported FAILED
+    in the result, and the action fails if more than max_errors (default 0) did.
+    """
+    cluster = params.get("cluster")
+    adjustment = int(params.get("adjustment", 1))
+    max_errors = int(params.get("max_errors", 0))
+    services = as_list(params.get("services")) + as_list(params.get("service"))
+    failed: List[Dict[str, Any]] = []
+    if params.get("targets"):
+        for arn in resolve_tag_selector("ecs:service", params["targets"]):
+            parsed = _parse_service_arn(arn)
+            if parsed is None:
+                failed.append({"service": arn, "status": "FAILED", "error": "not an ECS service ARN"})
+                continue
+            arn_cluster, name = parsed
+            # An old-format ARN has no cluster segment: assume the action's cluster
+            if arn_cluster in (None, cluster):
+                services.append(name)
+    services = list(dict.fromkeys(services))
+    if not services and not failed:
+        raise ValueError("scale_ecs_service: no target services resolved")
+
+    client = mock_boto3.client("ecs")
+    current = {}
+    for batch in chunks(services, ECS_MAX_SERVICES_PER_DESCRIBE):
+        res = client.describe_services(cluster=cluster, services=batch)
+        for svc in res.get("services", []):
+            current[svc["serviceName"]] = svc["desiredCount"]
+    failed += [{"service": s, "status": "FAILED", "error": f"not found in {cluster}"}
+               for s in services if s not in current]
+    found = [s for s in services if s in current]
+
+    limit = concurrency_limit(params.get("max_concurrency"), len(found))
+    print(f"  -> scale_ecs_service: Scaling {len(found)} services in {cluster} by {adjustment}")
+
+    def scale(name: str) -> Dict[str, Any]:
+        new_count = current[name] + adjustment
+        try:
+            client.update_service(cluster=cluster, service=name, desiredCount=new_count)
+        except Exception as e:
+            return {"service": name, "status": "FAILED", "error": str(e)}
+        return {"service": name, "status": "SUCCESS", "old": current[name], "new": new_count}
+
+    with ThreadPoolExecutor(max_workers=min(MAX_PARALLEL_CHUNKS, limit)) as pool:
+        results = list(pool.map(scale, found))
+    failed += [r for r in results if r["status"] == "FAILED"]
+
+    result = {
+        "status": "scaled",
+        "cluster": cluster,
+        "services": [r for r in results if r["status"] == "SUCCESS"] + failed,
+        "failed": len(failed)
+    }
+    if len(failed) > max_errors:
+        raise RuntimeError(f"scale_ecs_service: {len(failed)}/{len(result['services'])} "
+                           f"services failed (max_errors={max_errors}): {[f['service'] for f in failed]}")
+    return result
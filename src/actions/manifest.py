@@ -0,0 +1,52 @@
+"""
+Built-in action manifest.
+
+Pure data, so the planner can validate runbooks without importing any action module.
+Each entry maps an action type to "module:function" and declares its params:
+  type: str | int | list | dict (or a list of these), required: bool
+  one_of: at least one of these params must be set
+Plugins register more actions through the "runbook_ranger.actions" entry point group,
+whose entries point at a dict in this same format.
+"""
+
+ACTIONS = {
+    "scale_asg": {
+        "target": "src.actions.autoscaling:scale_asg",
+        "params": {
+            "asg_name": {"type": "str", "required": True},
+            "adjustment": {"type": "int"},
+        },
+    },
+    "ssm_restart_service": {
+        "target": "src.actions.ssm:ssm_restart_service",
+        "params": {
+            "service_name": {"type": "str", "required": True},
+            "instance_id": {"type": "str"},
+            "instance_ids": {"type": ["list", "str"]},
+            "targets": {"type": "dict"},
+            "max_concurrency": {"type": ["str", "int"]},
+            "max_errors": {"type": "int"},
+        },
+        "one_of": ["instance_id", "instance_ids", "targets"],
+    },
+    "scale_ecs_service": {
+        "target": "src.actions.ecs:scale_ecs_service",
+        "params": {
+            "cluster": {"type": "str", "required": True},
+            "service": {"type": "str"},
+            "services": {"type": ["list", "str"]},
+            "targets": {"type": "dict"},
+            "adjustment": {"type": "int"},
+            "max_concurrency": {"type": ["str", "int"]},
+            "max_errors": {"type": "int"},
+        },
+        "one_of": ["service", "services", "targets"],
+    },
+    "rollback_deployment": {
+        "target": "src.actions.deploy:rollback_deployment",
+        "params": {
+            "target_type": {"type": "str", "required": True},
+            "target_id": {"type": "str", "required": True},
+        },
+    },
+}
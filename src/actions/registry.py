@@ -0,0 +1,98 @@
+import importlib
+from typing import Any, Callable, Dict, List, Optional
+from src.actions.manifest import ACTIONS
+from src.shared.profiling import profiled
+
+ENTRY_POINT_GROUP = "runbook_ranger.actions"
+
+_TYPES = {"str": str, "int": int, "list": list, "dict": dict}
+
+def _check_spec(action_type: str, spec: Dict[str, Any], source: str = "manifest"):
+    """Rejects a spec whose params declare a type validate() cannot check."""
+    for name, rule in spec.get("params", {}).items():
+        declared = rule.get("type")
+        if declared is None:
+            continue
+        for t in [declared] if isinstance(declared, str) else declared:
+            if t not in _TYPES:
+                raise ValueError(f"{source}: action '{action_type}' param '{name}' declares unknown type "
+                                 f"{t!r} (expected one of {', '.join(_TYPES)})")
+
+class ActionRegistry:
+    """
+    Maps action types to implementations.
+    Specs come from the built-in manifest and, only when a type is not built in, from
+    entry point plugins. Implementation modules are imported on first use, so a cold
+    start only pays for the actions it actually runs.
+    """
+    def __init__(self, manifest: Optional[Dict[str, Dict[str, Any]]] = None):
+        self._specs: Dict[str, Dict[str, Any]] = dict(ACTIONS if manifest is None else manifest)
+        for action_type, spec in self._specs.items():
+            _check_spec(action_type, spec)
+        self._plugins_loaded = False
+        self._table: Dict[str, Callable] = {}  # dispatch table, filled on first use per type
+
+    def _load_plugins(self):
+        if self._plugins_loaded:
+            return
+        from importlib.metadata import entry_points
+        # Schemas are checked as plugins register, so a bad one fails here by name rather than
+        # as a KeyError in validate(); nothing is registered until every plugin passed
+        plugins: Dict[str, Dict[str, Any]] = {}
+        for ep in entry_points(group=ENTRY_POINT_GROUP):
+            for action_type, spec in ep.load().items():
+                _check_spec(action_type, spec, source=f"action plugin '{ep.name}'")
+                plugins.setdefault(action_type, spec)
+        for action_type, spec in plugins.items():
+            self._specs.setdefault(action_type, spec)
+        self._plugins_loaded = True
+
+    def spec(self, action_type: str) -> Optional[Dict[str, Any]]:
+        if action_type not in self._specs:
+            self._load_plugins()
+        return self._specs.get(action_type)
+
+    def validate(self, action_type: str, params: Dict[str, Any]) -> List[str]:
+        """Checks params against the declared schema. Returns a list of problems (empty if valid)."""
+        spec = self.spec(action_type)
+        if spec is None:
+            return [f"unknown action type '{action_type}'"]
+        declared = spec.get("params", {})
+        errors = []
+        for name, value in params.items():
+            if name not in declared:
+                errors.append(f"{action_type}: unknown param '{name}'")
+                continue
+            # ${...} templates are resolved at plan time; their type is checked then
+            if isinstance(value, str) and "${" in value:
+                continue
+            allowed = declared[name].get("type")
+            if allowed:
+                allowed = [allowed] if isinstance(allowed, str) else allowed
+                if not any(isinstance(value, _TYPES[t]) and not isinstance(value, bool) for t in allowed):
+                    errors.append(f"{action_type}: param '{name}' must be {' or '.join(allowed)}")
+        for name, rule in declared.items():
+            if rule.get("required") and name not in params:
+                errors.append(f"{action_type}: missing required param '{name}'")
+        one_of = spec.get("one_of")
+        if one_of and not any(name in params for name in one_of):
+            errors.append(f"{action_type}: needs one of {', '.join(one_of)}")
+        return errors
+
+    def get(self, action_type: str) -> Callable:
+        fn = self._table.get(action_type)
+        if fn is None:
+            spec = self.spec(action_type)
+            if spec is None:
+                raise NotImplementedError(f"Action {action_type} not implemented")
+            module_name, _, attr = spec["target"].partition(":")
+            fn = getattr(importlib.import_module(module_name), attr)
+            self._table[action_type] = fn
+        return fn
+
+    @profiled("action_execution")
+    def execute(self, action_type: str, params: dict):
+        return self.get(action_type)(params)
+
+# Singleton
+registry = ActionRegistry()
@@ -0,0 +1,108 @@
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+from src.shared.aws_mock import mock_boto3
+from src.actions.common import MAX_PARALLEL_CHUNKS, as_list, chunks, concurrency_limit, resolve_tag_selector
+
+# SendCommand accepts at most 50 InstanceIds per call
+SSM_MAX_INSTANCES_PER_COMMAND = 50
+
+SSM_POLL_INTERVAL_SECONDS = 2.0
+# Budget for the whole action, all chunks included. It must fit inside the executor Lambda's
+# 60s timeout (infra/stacks/ranger_stack.py) with room left for the other actions and the
+# final commit: a Lambda killed mid-wait leaves its incident claimed until the lease expires
+SSM_COMMAND_TIMEOUT_SECONDS = 40
+SSM_TERMINAL_STATUSES = {"Success", "Failed", "Cancelled", "TimedOut"}
+
+def _wait_for_invocations(client, command_id: str, expected: int, deadline: float) -> Dict[str, str]:
+    """
+    Polls all invocations of a command with ListCommandInvocations (one paginated call per poll)
+    until every target reached a terminal status, or the monotonic `deadline` passes.
+    Returns {instance_id: status}.
+    """
+    while True:
+        statuses, token = {}, None
+        while True:
+            kwargs = {"CommandId": command_id}
+            if token:
+                kwargs["NextToken"] = token
+            res = client.list_command_invocations(**kwargs)
+            for inv in res.get("CommandInvocations", []):
+                statuses[inv["InstanceId"]] = inv["Status"]
+            token = res.get("NextToken")
+            if not token:
+                break
+
+        if len(statuses) >= expected and all(s in SSM_TERMINAL_STATUSES for s in statuses.values()):
+            return statuses
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"SSM command {command_id} did not complete within the "
+                               f"{SSM_COMMAND_TIMEOUT_SECONDS}s action budget")
+        time.sleep(max(0.0, min(SSM_POLL_INTERVAL_SECONDS, deadline - time.monotonic())))
+
+def ssm_restart_service(params):
+    """
+    Restarts a service on one or many instances.
+    Targets: instance_id, instance_ids (list) and/or targets (tag selector).
+    Safety: max_concurrency (count or %) caps instances restarting at once,
+    max_errors is the number of failed invocations tolerated.
+    """
+    service = params.get("service_name")
+    instance_ids = as_list(params.get("instance_ids")) + as_list(params.get("instance_id"))
+    if params.get("targets"):
+        arns = resolve_tag_selector("ec2:instance", params["targets"])
+        instance_ids += [arn.rsplit("/", 1)[-1] for arn in arns]
+    instance_ids = list(dict.fromkeys(instance_ids))  # dedupe, keep order
+    if not instance_ids:
+        raise ValueError("ssm_restart_service: no target instances resolved")
+
+    limit = concurrency_limit(params.get("max_concurrency"), len(instance_ids))
+    max_errors = int(params.get("max_errors", 0))
+
+    # A chunk holds its worker until all its invocations finish,
+    # so at most workers * chunk_size instances restart at once (<= limit)
+    chunk_size = min(SSM_MAX_INSTANCES_PER_COMMAND, limit)
+    batches = chunks(instance_ids, chunk_size)
+    workers = min(MAX_PARALLEL_CHUNKS, max(1, limit // chunk_size), len(batches))
+    print(f"  -> ssm_restart_service: Rebooting {service} on {len(instance_ids)} instances "
+          f"({len(batches)} chunks, {workers} in parallel)")
+
+    client = mock_boto3.client("ssm")
+    # One deadline for every chunk, so queued chunks cannot stretch the action past the budget
+    deadline = time.monotonic() + SSM_COMMAND_TIMEOUT_SECONDS
+
+    def run_chunk(chunk: List[str]) -> Dict[str, Any]:
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"ssm_restart_service: {SSM_COMMAND_TIMEOUT_SECONDS}s action budget spent "
+                               f"before {len(chunk)} instances were started")
+        res = client.send_command(
+            InstanceIds=chunk,
+            DocumentName="AWS-RunShellScript",
+            Parameters={"commands": [f"systemctl restart {service}"]},
+            MaxConcurrency=str(len(chunk)),
+            MaxErrors=str(max_errors)
+        )
+        command_id = res["Command"]["CommandId"]
+        statuses = _wait_for_invocations(client, command_id, len(chunk), deadline)
+        return {
+            "command_id": command_id,
+            "targets": len(chunk),
+            "status_counts": dict(Counter(statuses.values())),
+            "failed": [i for i, s in statuses.items() if s != "Success"]
+        }
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        summaries = list(pool.map(run_chunk, batches))
+
+    failed = sum(len(s["failed"]) for s in summaries)
+    result = {
+        "command_ids": [s["command_id"] for s in summaries],
+        "targets": len(instance_ids),
+        "failed": failed,
+        "chunks": summaries
+    }
+    if failed > max_errors:
+        raise RuntimeError(f"ssm_restart_service: {failed}/{len(instance_ids)} invocations failed "
+                           f"(max_errors={max_errors}): {result['command_ids']}")
+    return result
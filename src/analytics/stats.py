@@ -0,0 +1,248 @@
+import os
+from array import array
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+import numpy as np
+
+STATES = ["OPEN", "MITIGATING", "RESOLVED", "FAILED", "EXECUTING"]
+ACTION_STATUSES = ["PENDING", "IN_PROGRESS", "SUCCESS", "FAILED", "SKIPPED"]
+UNMATCHED = "(unmatched)"
+
+_STATE_CODE = {s: i for i, s in enumerate(STATES)}
+_STATUS_CODE = {s: i for i, s in enumerate(ACTION_STATUSES)}
+RESOLVED, FAILED = _STATE_CODE["RESOLVED"], _STATE_CODE["FAILED"]
+IN_PROGRESS, SUCCESS = _STATUS_CODE["IN_PROGRESS"], _STATUS_CODE["SUCCESS"]
+
+class _Codes:
+    """Dictionary-encodes strings to dense int codes."""
+    def __init__(self):
+        self.values: List[str] = []
+        self._index: Dict[str, int] = {}
+
+    def code(self, value: str) -> int:
+        c = self._index.get(value)
+        if c is None:
+            c = self._index[value] = len(self.values)
+            self.values.append(value)
+        return c
+
+def to_epoch(timestamps: List[Optional[str]]) -> np.ndarray:
+    """ISO-8601 UTC strings -> float seconds since epoch (NaN where missing), parsed by numpy in bulk."""
+    cleaned = [(t[:-1] if t.endswith("Z") else t) if t else "" for t in timestamps]
+    us = np.array(cleaned, dtype="datetime64[us]")
+    out = us.astype("int64").astype("float64") / 1e6
+    out[np.isnat(us)] = np.nan
+    return out
+
+def _iso(epoch: float) -> str:
+    return datetime.fromtimestamp(epoch, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+class StatsFrame:
+    """
+    Columnar view of incidents and action logs.
+    Strings are dictionary-encoded (runbook, alarm, action) and timestamps are float epoch seconds,
+    so every metric is a handful of vectorized NumPy operations.
+    """
+    def __init__(self):
+        self.incident_ids = _Codes()
+        self.runbooks = _Codes()
+        self.alarms = _Codes()
+        self.actions = _Codes()
+        self.steps = _Codes()
+        self.n_incidents = 0
+        # Incident columns
+        self.inc_created = np.empty(0)
+        self.inc_resolved = np.empty(0)
+        self.inc_state = np.empty(0, dtype=np.int8)
+        self.inc_runbook = np.empty(0, dtype=np.int32)
+        self.inc_alarm = np.empty(0, dtype=np.int32)
+        # Action log columns (one row per log entry)
+        self.act_incident = np.empty(0, dtype=np.int32)
+        self.act_action = np.empty(0, dtype=np.int32)
+        self.act_step = np.empty(0, dtype=np.int32)
+        self.act_ts = np.empty(0)
+        self.act_status = np.empty(0, dtype=np.int8)
+
+    @classmethod
+    def from_storage(cls, storage) -> 'StatsFrame':
+        """Streams raw items out of storage into columns without building pydantic models."""
+        frame = cls()
+        created, resolved = [], []
+        state, runbook, alarm = array("b"), array("i"), array("i")
+        for item in storage.iter_incident_items():
+            frame.incident_ids.code(item["incident_id"])
+            created.append(item.get("created_at"))
+            resolved.append(item.get("resolved_at"))
+            state.append(_STATE_CODE.get(item.get("state"), -1))
+            runbook.append(frame.runbooks.code(item.get("runbook_id") or UNMATCHED))
+            alarm.append(frame.alarms.code(item.get("alarm_name") or ""))
+        frame.n_incidents = len(created)
+        frame.inc_created = to_epoch(created)
+        frame.inc_resolved = to_epoch(resolved)
+        frame.inc_state = np.frombuffer(state, dtype=np.int8).copy()
+        frame.inc_runbook = np.frombuffer(runbook, dtype=np.int32).copy()
+        frame.inc_alarm = np.frombuffer(alarm, dtype=np.int32).copy()
+
+        ts = []
+        inc, action, step, status = array("i"), array("i"), array("i"), array("b")
+        for item in storage.iter_action_items():
+            # Unknown incidents get codes >= n_incidents and are filtered out later
+            inc.append(frame.incident_ids.code(item["incident_id"]))
+            action.append(frame.actions.code(item.get("action_type") or item["action_id"]))
+            step.append(frame.steps.code(item["action_id"]))
+            status.append(_STATUS_CODE.get(item.get("status"), -1))
+            ts.append(item.get("timestamp"))
+        frame.act_incident = np.frombuffer(inc, dtype=np.int32).copy()
+        frame.act_action = np.frombuffer(action, dtype=np.int32).copy()
+        frame.act_step = np.frombuffer(step, dtype=np.int32).copy()
+        frame.act_status = np.frombuffer(status, dtype=np.int8).copy()
+        frame.act_ts = to_epoch(ts)
+        return frame
+
+    def _incident_mask(self, runbook: Optional[str], since: Optional[float], until: Optional[float]) -> np.ndarray:
+        mask = np.ones(self.n_incidents, dtype=bool)
+        if runbook is not None:
+            code = self.runbooks._index.get(runbook, -1)
+            mask &= self.inc_runbook == code
+        if since is not None:
+            mask &= self.inc_created >= since
+        if until is not None:
+            mask &= self.inc_created < until
+        return mask
+
+    def _action_runs(self, inc_mask: np.ndarray):
+        """
+        Collapses log rows into one row per (incident, action_id) run, returning each run's
+        action type: latency = last entry - first IN_PROGRESS entry, outcome = last entry's status.
+        Runbook steps of the same type are separate runs.
+        """
+        keep = self.act_incident < self.n_incidents
+        keep[keep] &= inc_mask[self.act_incident[keep]]
+        inc, action, step = self.act_incident[keep], self.act_action[keep], self.act_step[keep]
+        ts, status = self.act_ts[keep], self.act_status[keep]
+        if len(inc) == 0:
+            empty = np.empty(0)
+            return empty.astype(np.int32), empty, empty.astype(np.int8)
+
+        order = np.lexsort((ts, step, inc))
+        inc, action, step, ts, status = inc[order], action[order], step[order], ts[order], status[order]
+        new_group = np.ones(len(inc), dtype=bool)
+        new_group[1:] = (inc[1:] != inc[:-1]) | (step[1:] != step[:-1])
+        first = np.flatnonzero(new_group)
+        last = np.append(first[1:], len(inc)) - 1
+        latency = np.where(status[first] == IN_PROGRESS, ts[last] - ts[first], np.nan)
+        latency[first == last] = np.nan  # single entry (e.g. SKIPPED): no latency
+        return action[first], latency, status[last]
+
+    def compute(self, runbook: Optional[str] = None, since: Optional[str] = None,
+                until: Optional[str] = None, bucket_seconds: int = 3600) -> Dict[str, Any]:
+        since_ts = to_epoch([since])[0] if since else None
+        until_ts = to_epoch([until])[0] if until else None
+        mask = self._incident_mask(runbook, since_ts, until_ts)
+        created, resolved = self.inc_created[mask], self.inc_resolved[mask]
+        state, rb = self.inc_state[mask], self.inc_runbook[mask]
+
+        # MTTR
+        is_resolved = (state == RESOLVED) & ~np.isnan(resolved)
+        ttr = (resolved[is_resolved] - created[is_resolved]) / 60
+
+        # Success rate per runbook (over finished incidents)
+        finished = (state == RESOLVED) | (state == FAILED)
+        n_rb = len(self.runbooks.values)
+        total_rb = np.bincount(rb, minlength=n_rb)
+        finished_rb = np.bincount(rb[finished], minlength=n_rb)
+        resolved_rb = np.bincount(rb[state == RESOLVED], minlength=n_rb)
+        runbooks = {}
+        for code in np.flatnonzero(total_rb):
+            runbooks[self.runbooks.values[code]] = {
+                "incidents": int(total_rb[code]),
+                "resolved": int(resolved_rb[code]),
+                "failed": int(finished_rb[code] - resolved_rb[code]),
+                "success_rate": _rate(resolved_rb[code], finished_rb[code]),
+            }
+
+        # Per-action runs
+        run_action, run_latency, run_status = self._action_runs(mask)
+        actions = {}
+        order = np.argsort(run_action, kind="stable")
+        run_action, run_latency, run_status = run_action[order], run_latency[order], run_status[order]
+        bounds = np.flatnonzero(np.diff(run_action)) + 1
+        for idx in np.split(np.arange(len(run_action)), bounds):
+            if len(idx) == 0:
+                continue
+            lat = run_latency[idx]
+            actions[self.actions.values[run_action[idx[0]]]] = {
+                "runs": int(len(idx)),
+                "success_rate": _rate(np.count_nonzero(run_status[idx] == SUCCESS), len(idx)),
+                "latency_seconds": _distribution(lat[~np.isnan(lat)]),
+            }
+
+        # Incident rate per time bucket
+        buckets = []
+        valid_created = created[~np.isnan(created)]
+        if len(valid_created):
+            start = np.floor(valid_created.min() / bucket_seconds) * bucket_seconds
+            counts = np.bincount(((valid_created - start) // bucket_seconds).astype(np.int64))
+            buckets = [{"start": _iso(start + i * bucket_seconds), "count": int(c)} for i, c in enumerate(counts)]
+
+        return {
+            "filters": {"runbook": runbook, "since": since, "until": until},
+            "incidents": {
+                "total": int(mask.sum()),
+                "resolved": int(np.count_nonzero(state == RESOLVED)),
+                "failed": int(np.count_nonzero(state == FAILED)),
+                "unfinished": int(np.count_nonzero(~finished)),
+            },
+            "mttr_minutes": _distribution(ttr),
+            "runbooks": runbooks,
+            "actions": actions,
+            "incident_rate": {"bucket_seconds": bucket_seconds, "buckets": buckets},
+        }
+
+    def to_parquet(self, out_dir: str) -> Dict[str, str]:
+        """Writes incidents.parquet and action_logs.parquet (needs pyarrow)."""
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("Parquet export needs pyarrow: pip install pyarrow")
+
+        def dictionary(codes, values):
+            return pa.DictionaryArray.from_arrays(pa.array(codes), pa.array(values, type=pa.string()))
+
+        os.makedirs(out_dir, exist_ok=True)
+        paths = {"incidents": os.path.join(out_dir, "incidents.parquet"),
+                 "action_logs": os.path.join(out_dir, "action_logs.parquet")}
+        n = self.n_incidents
+        pq.write_table(pa.table({
+            "incident_id": pa.array(self.incident_ids.values[:n], type=pa.string()),
+            "created_at": self.inc_created,
+            "resolved_at": self.inc_resolved,
+            "state": dictionary(self.inc_state, STATES),
+            "runbook_id": dictionary(self.inc_runbook, self.runbooks.values),
+            "alarm_name": dictionary(self.inc_alarm, self.alarms.values),
+        }), paths["incidents"])
+        pq.write_table(pa.table({
+            "incident_id": dictionary(self.act_incident, self.incident_ids.values),
+            "action": dictionary(self.act_action, self.actions.values),
+            "action_id": dictionary(self.act_step, self.steps.values),
+            "timestamp": self.act_ts,
+            "status": dictionary(self.act_status, ACTION_STATUSES),
+        }), paths["action_logs"])
+        return paths
+
+def _rate(ok, total) -> Optional[float]:
+    return round(float(ok) / float(total), 4) if total else None
+
+def _distribution(values: np.ndarray) -> Dict[str, Any]:
+    if len(values) == 0:
+        return {"count": 0}
+    p50, p90, p99 = np.percentile(values, [50, 90, 99])
+    return {
+        "count": int(len(values)),
+        "mean": round(float(values.mean()), 3),
+        "p50": round(float(p50), 3),
+        "p90": round(float(p90), 3),
+        "p99": round(float(p99), 3),
+        "max": round(float(values.max()), 3),
+    }
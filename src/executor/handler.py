@@ -1,9 +1,26 @@
+import calendar
 import time
-from src.shared.storage import db
-from src.shared.models import ActionLog, ActionStatus, IncidentState
-from src.shared.actions import action_handler
+import uuid
+from typing import Optional
+from src.shared.storage import db, StateConflictError
+from src.shared.models import ActionLog, ActionStatus, Incident, IncidentState
+from src.actions.registry import registry
+from src.shared.limits import blast_radius
+from src.shared.profiling import profiled
 
-def execute_plan(incident_id: str):
+TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+# A claim older than this is presumed dead (the executor Lambda times out after 60s)
+# and the next executor may take it over
+EXECUTION_LEASE_SECONDS = 300
+
+def _claim_age(incident: Incident, now: float) -> float:
+    if not incident.claimed_at:
+        return float("inf")  # claimed before claims were timestamped
+    return now - calendar.timegm(time.strptime(incident.claimed_at, TIMESTAMP_FORMAT))
+
+@profiled("execute")
+def execute_plan(incident_id: str, force: bool = False):
     plan = db.get_plan(incident_id)
     if not plan:
         print(f"No plan found for incident {incident_id}")
@@ -11,30 +28,69 @@ def execute_plan(incident_id: str):
 
     print(f"Executing Plan for Incident {incident_id}...")
     
+    # Claim the incident: MITIGATING -> EXECUTING succeeds for exactly one executor.
+    # Anyone reading it afterwards sees EXECUTING and their claim fails the state check,
+    # unless the claim has outlived its lease (its executor crashed or timed out) or
+    # an operator forces a re-run. Either way the versioned write lets only one win.
     incident = db.get_incident(incident_id)
-    incident.state = IncidentState.MITIGATING
-    db.save_incident(incident)
+    if not incident:
+        print(f"Incident {incident_id} not found")
+        return
+    now = time.time()
+    expected_state = IncidentState.MITIGATING
+    if incident.state == IncidentState.EXECUTING:
+        age = _claim_age(incident, now)
+        if force or age > EXECUTION_LEASE_SECONDS:
+            print(f"Taking over the claim of {incident.claimed_by or 'an unknown executor'} "
+                  f"({age:.0f}s old)")
+            expected_state = IncidentState.EXECUTING
+    elif force and incident.state == IncidentState.FAILED:
+        print(f"Retrying FAILED incident {incident_id}")
+        expected_state = IncidentState.FAILED
+    incident.state = IncidentState.EXECUTING
+    incident.claimed_by = str(uuid.uuid4())
+    incident.claimed_at = time.strftime(TIMESTAMP_FORMAT, time.gmtime(now))
+    try:
+        db.save_incident(incident, expected_state=expected_state)
+    except StateConflictError as e:
+        print(f"Not executing: {e}")
+        return
 
     all_success = True
+    final_log = None  # Committed together with the final incident state
     
-    for action in plan.actions:
+    for n, action in enumerate(plan.actions):
         action_id = action["id"]
         action_type = action["type"]
         params = action["params"]
         
         # TODO: Check Idempotency (skip if already done)
         # TODO: Check Locks
+
+        violation = blast_radius.reserve(incident_id, action)
+        if violation:
+            final_log = ActionLog(
+                incident_id=incident_id,
+                action_id=action_id,
+                action_type=action_type,
+                status=ActionStatus.SKIPPED,
+                details={"reason": violation}
+            )
+            print(f"  [SKIPPED] {action_id}: {violation}")
+            all_success = False
+            break
         
         log = ActionLog(
             incident_id=incident_id,
             action_id=action_id,
+            action_type=action_type,
             status=ActionStatus.IN_PROGRESS
         )
         db.log_action(log)
         
         try:
             print(f"Running Action: {action_id} ({action_type})")
-            result = action_handler.execute(action_type, params)
+            result = registry.execute(action_type, params)
             
             log.status = ActionStatus.SUCCESS
             log.details = result
@@ -45,17 +101,52 @@ def execute_plan(incident_id: str):
             log.details = {"error": str(e)}
             print(f"  [FAILED] {e}")
             all_success = False
+            final_log = log
             break # Stop on error for now
             
-        db.log_action(log)
+        if n == len(plan.actions) - 1:
+            final_log = log
+        else:
+            db.log_action(log)
         
     # Update Incident State
     if all_success:
         incident.state = IncidentState.RESOLVED
-        incident.resolved_at = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        incident.resolved_at = time.strftime(TIMESTAMP_FORMAT, time.gmtime())
         print(f"Incident {incident_id} RESOLVED.")
     else:
         incident.state = IncidentState.FAILED
         print(f"Incident {incident_id} FAILED.")
         
-    db.save_incident(incident)
+    return _finish(incident, final_log)
+
+def _finish(incident: Incident, final_log: Optional[ActionLog]) -> Optional[Incident]:
+    """
+    Commits the final action log with EXECUTING -> RESOLVED/FAILED. The actions have
+    already run, so a conflict must not lose this: if some other write bumped the
+    version while we held the claim, the outcome is applied to a fresh copy instead.
+    A claim taken over by another executor is theirs to finish.
+    """
+    try:
+        with db.transaction() as tx:
+            if final_log:
+                tx.log_action(final_log)
+            tx.save_incident(incident, expected_state=IncidentState.EXECUTING)
+        return incident
+    except StateConflictError as e:
+        print(f"Final commit conflicted ({e}), retrying on the current incident")
+
+    current = db.get_incident(incident.incident_id)
+    if not current or current.state != IncidentState.EXECUTING or current.claimed_by != incident.claimed_by:
+        # No longer ours to finish; still record what ran
+        print(f"Incident {incident.incident_id} is {current.state.value if current else 'gone'} "
+              f"or claimed by another executor, keeping its state")
+        if final_log:
+            db.log_action(final_log)
+        return current
+    current.state, current.resolved_at = incident.state, incident.resolved_at
+    with db.transaction() as tx:
+        if final_log:
+            tx.log_action(final_log)
+        tx.save_incident(current, expected_state=IncidentState.EXECUTING)
+    return current
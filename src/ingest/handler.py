@@ -2,17 +2,20 @@ import json
 import os
 from src.shared.models import Incident, IncidentState, Severity
 from src.shared.storage import db
+from src.shared.profiling import profiled
 
 # In local mode, we might not use the actual Lambda context
+@profiled("ingest")
 def handler(event, context=None):
     """
     Ingest Lambda Handler.
     Receives CloudWatch Alarm State Change event.
     Creates an Incident in DynamoDB (or local storage).
     """
-    print(f"Received event: {json.dumps(event)}")
-    
+    # The raw event is persisted (deduplicated) by storage; log only its identity
     detail = event.get("detail", {})
+    print(f"Received event: id={event.get('id')} alarm={detail.get('alarmName')}")
+    
     alarm_name = detail.get("alarmName")
     new_state = detail.get("state", {}).get("value")
     
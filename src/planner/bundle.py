@@ -0,0 +1,144 @@
+import hashlib
+import json
+import os
+import time
+from functools import lru_cache
+from typing import Dict, Any, List, NamedTuple, Optional, Tuple, Union
+from src.planner.render import VAR_PATTERN, TEMPLATE_KEY
+
+# Bump when the on-disk layout changes; loaders refuse bundles of another format
+BUNDLE_FORMAT = 1
+
+class CompiledAction(NamedTuple):
+    id: str
+    type: str
+    params: Dict[str, Any]  # strings with ${...} replaced by precompiled templates
+    safety: Dict[str, Any]
+
+class CompiledRunbook(NamedTuple):
+    runbook_id: str
+    actions: List[CompiledAction]
+
+def compile_template(value: Any) -> Any:
+    """
+    Pre-splits ${...} strings into {TEMPLATE_KEY: [literal | [path...], ...]} so
+    rendering is lookups and joins, with no regex work at plan time.
+    """
+    if isinstance(value, list):
+        return [compile_template(v) for v in value]
+    if isinstance(value, dict):
+        return {k: compile_template(v) for k, v in value.items()}
+    if not isinstance(value, str) or not VAR_PATTERN.search(value):
+        return value
+    parts: List[Union[str, List[str]]] = []
+    pos = 0
+    for m in VAR_PATTERN.finditer(value):
+        if m.start() > pos:
+            parts.append(value[pos:m.start()])
+        parts.append(m.group(1).split("."))
+        pos = m.end()
+    if pos < len(value):
+        parts.append(value[pos:])
+    return {TEMPLATE_KEY: parts}
+
+class RunbookBundle:
+    """
+    Validated runbooks plus a match index. Matching walks the alarm name's prefixes
+    (a dict lookup each), so it costs O(len(alarm_name)) whatever the number of runbooks,
+    and keeps the YAML loader's "first runbook in file order wins" semantics.
+    """
+    def __init__(self, data: Dict[str, Any]):
+        if data.get("format") != BUNDLE_FORMAT:
+            raise ValueError(f"Unsupported runbook bundle format {data.get('format')} (expected {BUNDLE_FORMAT})")
+        self.version = data["version"]
+        self._raw = data["runbooks"]
+        self._compiled: Dict[int, CompiledRunbook] = {}  # built on first match only
+        index = data["index"]
+        self._by_namespace = index["by_namespace"]
+        self._any_namespace = index["any_namespace"]
+
+    def match(self, alarm_name: str, namespace: str) -> Optional[CompiledRunbook]:
+        best = None
+        for prefixes in (self._by_namespace.get(namespace), self._any_namespace):
+            if not prefixes:
+                continue
+            for i in range(len(alarm_name) + 1):
+                order = prefixes.get(alarm_name[:i])
+                if order is not None and (best is None or order < best):
+                    best = order
+        return self._runbook(best) if best is not None else None
+
+    def __len__(self) -> int:
+        return len(self._raw)
+
+    def _runbook(self, order: int) -> CompiledRunbook:
+        rb = self._compiled.get(order)
+        if rb is None:
+            raw = self._raw[order]
+            rb = self._compiled[order] = CompiledRunbook(raw["runbook_id"], [CompiledAction(**a) for a in raw["actions"]])
+        return rb
+
+def build_bundle(runbooks_dir: Optional[str] = None) -> Tuple[Dict[str, Any], List[str]]:
+    """
+    Loads and validates every runbook. Returns (bundle data, warnings); raises
+    ValueError listing every invalid file, since a bad runbook must fail the build.
+    """
+    import glob
+    from src.planner.loader import RUNBOOKS_DIR
+    from src.shared.runbook_models import Runbook
+
+    runbooks_dir = runbooks_dir or RUNBOOKS_DIR
+    files = glob.glob(os.path.join(runbooks_dir, "**/*.yaml"), recursive=True)
+    files += glob.glob(os.path.join(runbooks_dir, "**/*.yml"), recursive=True)
+
+    errors: List[str] = []
+    warnings: List[str] = []
+    runbooks: List[Dict[str, Any]] = []
+    seen_ids: Dict[str, str] = {}  # runbook_id -> file
+    by_namespace: Dict[str, Dict[str, int]] = {}
+    any_namespace: Dict[str, int] = {}
+    for f in sorted(files):
+        try:
+            rb = Runbook.load_from_file(f)
+        except Exception as e:
+            errors.append(f"{f}: {e}")
+            continue
+        if rb.runbook_id in seen_ids:
+            errors.append(f"{f}: duplicate runbook_id '{rb.runbook_id}' (also in {seen_ids[rb.runbook_id]})")
+            continue
+        seen_ids[rb.runbook_id] = f
+
+        prefixes = by_namespace.setdefault(rb.match.namespace, {}) if rb.match.namespace else any_namespace
+        prefix = rb.match.alarm_name_prefix or ""
+        if prefix in prefixes:
+            shadow = runbooks[prefixes[prefix]]["runbook_id"]
+            warnings.append(f"{f}: runbook '{rb.runbook_id}' is unreachable (shadowed by '{shadow}')")
+        else:
+            prefixes[prefix] = len(runbooks)
+        runbooks.append({
+            "runbook_id": rb.runbook_id,
+            "actions": [
+                {"id": a.id, "type": a.type, "params": compile_template(a.params), "safety": a.safety}
+                for a in rb.actions
+            ],
+        })
+    if errors:
+        raise ValueError("Invalid runbooks:\n" + "\n".join(errors))
+
+    body = {"runbooks": runbooks, "index": {"by_namespace": by_namespace, "any_namespace": any_namespace}}
+    version = hashlib.sha256(json.dumps(body, sort_keys=True).encode()).hexdigest()[:16]
+    return {"format": BUNDLE_FORMAT, "version": version, "compiled_at": int(time.time()), **body}, warnings
+
+def write_bundle(data: Dict[str, Any], path: str):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(data, f, separators=(",", ":"))
+    os.replace(tmp, path)
+
+@lru_cache(maxsize=None)
+def load_bundle(path: str) -> RunbookBundle:
+    """Loaded once per process (i.e. once per Lambda cold start)."""
+    with open(path, "r") as f:
+        bundle = RunbookBundle(json.load(f))
+    print(f"Loaded runbook bundle {bundle.version} ({len(bundle)} runbooks)")
+    return bundle
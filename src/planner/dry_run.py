@@ -0,0 +1,141 @@
+import json
+import os
+from collections import Counter
+from multiprocessing import Pool
+from typing import Dict, Any, List, Optional, Iterable
+from src.planner.loader import load_all_runbooks, match_runbook
+from src.planner.render import event_context, render_actions, unresolved_vars
+
+# Dry runs never touch storage: this module (and the worker processes) must not import src.shared.storage
+DEFAULT_CHUNKSIZE = 1000
+DEFAULT_SAMPLES = 5
+TOP_UNMATCHED = 20
+
+# Per-worker runbook sets, loaded once by the pool initializer
+_runbooks: List = []
+_compare: Optional[List] = None
+
+def _init_worker(runbooks_dir: Optional[str], compare_dir: Optional[str]):
+    global _runbooks, _compare
+    _runbooks = load_all_runbooks(runbooks_dir)
+    _compare = load_all_runbooks(compare_dir) if compare_dir else None
+
+def _plan(runbooks: List, alarm_name: str, namespace: str, context: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    runbook = match_runbook(runbooks, alarm_name, namespace)
+    if not runbook:
+        return None
+    actions, requires_approval = render_actions(runbook, context)
+    return {"runbook_id": runbook.runbook_id, "requires_approval": requires_approval, "actions": actions}
+
+def plan_event(line: str) -> Dict[str, Any]:
+    """Matches and renders one JSONL corpus line against the worker's runbooks. Pure: no storage."""
+    try:
+        event = json.loads(line)
+    except ValueError:
+        return {"status": "invalid"}
+    # A recorded corpus may hold anything: a line of the wrong shape is counted, never raised
+    detail = event.get("detail") if isinstance(event, dict) else None
+    if not isinstance(detail, dict) or not isinstance(detail.get("state"), dict):
+        return {"status": "invalid"}
+    alarm_name, value = detail.get("alarmName"), detail["state"].get("value")
+    if not alarm_name or not isinstance(alarm_name, str) or not value or not isinstance(value, str):
+        return {"status": "invalid"}
+    # Same filter as ingest: only ALARM transitions become incidents
+    if value != "ALARM":
+        return {"status": "ignored"}
+
+    try:
+        namespace, context = event_context(event)
+    except (AttributeError, TypeError, IndexError):
+        return {"status": "invalid"}  # malformed configuration.metrics block
+    result: Dict[str, Any] = {"status": "planned", "alarm_name": alarm_name, "namespace": namespace}
+    plan = _plan(_runbooks, alarm_name, namespace, context)
+    result["plan"] = plan
+    if plan:
+        result["unresolved"] = [(a["id"], var) for a in plan["actions"] for var in unresolved_vars(a["params"])]
+    if _compare is not None:
+        other = _plan(_compare, alarm_name, namespace, context)
+        if other != plan:
+            result["compare_plan"] = other
+    return result
+
+def _read_lines(corpus_file: str) -> Iterable[str]:
+    with open(corpus_file, "r") as f:
+        for line in f:
+            if line.strip():
+                yield line
+
+def _diff_kind(plan: Optional[Dict[str, Any]], other: Optional[Dict[str, Any]]) -> str:
+    if plan is None:
+        return "newly_unmatched"
+    if other is None:
+        return "newly_matched"
+    if plan["runbook_id"] != other["runbook_id"]:
+        return "runbook_changed"
+    return "plan_changed"
+
+def dry_run(corpus_file: str, runbooks_dir: Optional[str] = None, compare_dir: Optional[str] = None,
+            workers: Optional[int] = None, samples: int = DEFAULT_SAMPLES,
+            chunksize: int = DEFAULT_CHUNKSIZE) -> Dict[str, Any]:
+    """
+    Plans every alarm in a JSONL corpus against `runbooks_dir` in a process pool and
+    reports coverage. With `compare_dir`, also diffs each plan against those runbooks
+    (plans from `compare_dir` are the baseline, `runbooks_dir` the candidate).
+    """
+    workers = workers or os.cpu_count() or 1
+    counts: Counter[str] = Counter()
+    unmatched: Counter[str] = Counter()
+    by_runbook: Counter[str] = Counter()
+    unresolved: Counter[str] = Counter()
+    diffs: Counter[str] = Counter()
+    diff_samples: List[Dict[str, Any]] = []
+    unresolved_samples: List[Dict[str, Any]] = []
+
+    def consume(results):
+        for r in results:
+            counts["events"] += 1
+            counts[r["status"]] += 1
+            if r["status"] != "planned":
+                continue
+            plan = r["plan"]
+            if plan is None:
+                unmatched[r["alarm_name"]] += 1
+            else:
+                counts["matched"] += 1
+                by_runbook[plan["runbook_id"]] += 1
+                for action_id, var in r["unresolved"]:
+                    key = f"{plan['runbook_id']}.{action_id}: ${{{var}}}"
+                    if not unresolved[key] and len(unresolved_samples) < samples:
+                        unresolved_samples.append({"alarm_name": r["alarm_name"], "reference": key})
+                    unresolved[key] += 1
+            if "compare_plan" in r:
+                kind = _diff_kind(plan, r["compare_plan"])
+                diffs[kind] += 1
+                if len(diff_samples) < samples:
+                    diff_samples.append({"alarm_name": r["alarm_name"], "kind": kind,
+                                         "before": r["compare_plan"], "after": plan})
+
+    if workers == 1:
+        _init_worker(runbooks_dir, compare_dir)
+        consume(plan_event(line) for line in _read_lines(corpus_file))
+    else:
+        with Pool(workers, initializer=_init_worker, initargs=(runbooks_dir, compare_dir)) as pool:
+            consume(pool.imap(plan_event, _read_lines(corpus_file), chunksize=chunksize))
+
+    planned = counts["planned"]
+    report: Dict[str, Any] = {
+        "events": counts["events"],
+        "alarms": planned,
+        "ignored": counts["ignored"],
+        "invalid": counts["invalid"],
+        "matched": counts["matched"],
+        "unmatched": planned - counts["matched"],
+        "coverage": round(counts["matched"] / planned, 4) if planned else None,
+        "by_runbook": dict(by_runbook.most_common()),
+        "top_unmatched": dict(unmatched.most_common(TOP_UNMATCHED)),
+        "unresolved": dict(unresolved.most_common()),
+        "unresolved_samples": unresolved_samples,
+    }
+    if compare_dir:
+        report["diff"] = {"changed": sum(diffs.values()), "by_kind": dict(diffs), "samples": diff_samples}
+    return report
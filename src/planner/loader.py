@@ -1,17 +1,32 @@
 import os
 import glob
-from typing import List, Optional
-from src.shared.runbook_models import Runbook
+from typing import List, Optional, TYPE_CHECKING
+from src.shared.profiling import profiled
+
+if TYPE_CHECKING:
+    from src.shared.runbook_models import Runbook
 
 RUNBOOKS_DIR = os.path.join(os.getcwd(), "runbooks")
 
-def load_all_runbooks() -> List[Runbook]:
+def bundle_path() -> Optional[str]:
+    """
+    Compiled bundle to plan from (set on the Lambdas; see `rr compile-runbooks`).
+    Relative paths resolve against the Lambda task root. Unset: read runbooks/ YAML.
+    """
+    path = os.environ.get("RUNBOOK_BUNDLE")
+    if not path:
+        return None
+    return os.path.join(os.environ.get("LAMBDA_TASK_ROOT", ""), path)
+
+def load_all_runbooks(runbooks_dir: Optional[str] = None) -> List["Runbook"]:
+    from src.shared.runbook_models import Runbook
+    runbooks_dir = runbooks_dir or RUNBOOKS_DIR
     runbooks = []
-    # Recursively find .yaml or .yml files
-    files = glob.glob(os.path.join(RUNBOOKS_DIR, "**/*.yaml"), recursive=True)
-    files += glob.glob(os.path.join(RUNBOOKS_DIR, "**/*.yml"), recursive=True)
+    # Recursively find .yaml or .yml files (sorted, so "first match" is stable)
+    files = glob.glob(os.path.join(runbooks_dir, "**/*.yaml"), recursive=True)
+    files += glob.glob(os.path.join(runbooks_dir, "**/*.yml"), recursive=True)
     
-    for f in files:
+    for f in sorted(files):
         try:
             rb = Runbook.load_from_file(f)
             runbooks.append(rb)
@@ -20,12 +35,11 @@ def load_all_runbooks() -> List[Runbook]:
             
     return runbooks
 
-def find_matching_runbook(alarm_name: str, namespace: str) -> Optional[Runbook]:
+def match_runbook(runbooks: List["Runbook"], alarm_name: str, namespace: str) -> Optional["Runbook"]:
     """
     Finds the first runbook that matches the alarm criteria.
     Simple prefix matching for now.
     """
-    runbooks = load_all_runbooks()
     for rb in runbooks:
         # Check Namespace
         if rb.match.namespace and rb.match.namespace != namespace:
@@ -37,3 +51,11 @@ def find_matching_runbook(alarm_name: str, namespace: str) -> Optional[Runbook]:
             
         return rb
     return None
+
+@profiled("runbook_match")
+def find_matching_runbook(alarm_name: str, namespace: str):
+    path = bundle_path()
+    if path:
+        from src.planner.bundle import load_bundle
+        return load_bundle(path).match(alarm_name, namespace)
+    return match_runbook(load_all_runbooks(), alarm_name, namespace)
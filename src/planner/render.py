@@ -0,0 +1,118 @@
+import re
+from typing import Dict, Any, List, Tuple, Union, TYPE_CHECKING
+from src.shared.profiling import profiled
+
+if TYPE_CHECKING:
+    from src.shared.runbook_models import Runbook
+    from src.planner.bundle import CompiledRunbook
+
+# Pure planning logic (no storage access), shared by the planner Lambda and dry runs
+VAR_PATTERN = re.compile(r"\$\{(.+?)\}")
+# Marks a string precompiled by src.planner.bundle: {TEMPLATE_KEY: [literal | [path...], ...]}
+TEMPLATE_KEY = "$tmpl"
+
+def _resolve_vars(text: str, context: Dict[str, Any]) -> str:
+    """
+    Resolves variables like ${dimensions.InstanceId} from context.
+    """
+    if not isinstance(text, str):
+        return text
+    
+    def replacer(match):
+        path = match.group(1).split(".")
+        value = context
+        for key in path:
+            if isinstance(value, dict):
+                value = value.get(key)
+            else:
+                return match.group(0) # Failed to resolve
+            if value is None:
+                return match.group(0)
+        return str(value)
+        
+    return VAR_PATTERN.sub(replacer, text)
+
+def _lookup(path: List[str], context: Dict[str, Any]) -> Any:
+    value: Any = context
+    for key in path:
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+        if value is None:
+            return None
+    return value
+
+def _render_template(parts: List[Any], context: Dict[str, Any]) -> str:
+    # Same output as _resolve_vars on the original string, without the regex pass
+    out = []
+    for part in parts:
+        if isinstance(part, str):
+            out.append(part)
+            continue
+        value = _lookup(part, context)
+        out.append("${" + ".".join(part) + "}" if value is None else str(value))
+    return "".join(out)
+
+def _resolve_value(value: Any, context: Dict[str, Any]) -> Any:
+    # Target lists and tag selectors may contain variables too
+    if isinstance(value, list):
+        return [_resolve_value(v, context) for v in value]
+    if isinstance(value, dict):
+        if TEMPLATE_KEY in value:
+            return _render_template(value[TEMPLATE_KEY], context)
+        return {k: _resolve_value(v, context) for k, v in value.items()}
+    return _resolve_vars(value, context)
+
+@profiled("param_resolution")
+def _resolve_params(params: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any]:
+    resolved = {}
+    for k, v in params.items():
+        resolved[k] = _resolve_value(v, context)
+    return resolved
+
+def event_context(event: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+    """Returns (namespace, variable context) for a CloudWatch alarm event."""
+    cw_detail = event.get("detail", {})
+    metrics = cw_detail.get("configuration", {}).get("metrics", [])
+    
+    # Flatten context for variable resolution
+    context = cw_detail.copy()
+    
+    # Try to find dimensions from the first metric
+    # In real world, we'd handle multiple metrics more robustly
+    namespace = "Unknown"
+    
+    if metrics:
+        metric = metrics[0].get("metricStat", {}).get("metric", {})
+        namespace = metric.get("namespace", "Unknown")
+        context["dimensions"] = metric.get("dimensions", {})
+        context["namespace"] = namespace
+    return namespace, context
+
+def render_actions(runbook: Union["Runbook", "CompiledRunbook"], context: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], bool]:
+    """Resolves a runbook's actions against the context. Returns (actions, requires_approval)."""
+    actions = []
+    requires_approval = False
+    
+    for action_def in runbook.actions:
+        resolved_params = _resolve_params(action_def.params, context)
+        action_plan = {
+            "id": action_def.id,
+            "type": action_def.type,
+            "params": resolved_params,
+            "sanity_checks": action_def.safety
+        }
+        actions.append(action_plan)
+        if action_def.safety.get("approval_required", False):
+            requires_approval = True
+    return actions, requires_approval
+
+def unresolved_vars(value: Any) -> List[str]:
+    """${...} references left in rendered params (missing from the event)."""
+    if isinstance(value, str):
+        return VAR_PATTERN.findall(value)
+    if isinstance(value, list):
+        return [v for item in value for v in unresolved_vars(item)]
+    if isinstance(value, dict):
+        return [v for item in value.values() for v in unresolved_vars(item)]
+    return []
@@ -1,11 +1,32 @@
+import itertools
+import threading
 from typing import Dict, Any, List
 
+# Demo fleet for load tests (rr simulate --shards): fleet-asg-000 .. fleet-asg-199
+MOCK_FLEET_ASGS = 200
+
 class MockBoto3:
     """Simulates Boto3 client behavior for local testing"""
     
     def __init__(self):
         self._asg_state = {"app-prod-asg": {"DesiredCapacity": 2, "MaxSize": 5}}
+        self._asg_state.update({f"fleet-asg-{n:03d}": {"DesiredCapacity": 2, "MaxSize": 5}
+                                for n in range(MOCK_FLEET_ASGS)})
         self._ecs_state = {"my-cluster/my-service": {"desiredCount": 2}}
+        self._ssm_state = {"commands": {}, "lock": threading.Lock()}
+        # Tagged resources for the Resource Groups Tagging API mock
+        self._tagged_resources = [
+            {
+                "ResourceARN": f"arn:aws:ec2:us-east-1:123456789012:instance/i-{n:017x}",
+                "Tags": [{"Key": "Role", "Value": "web"}, {"Key": "allow-remediation", "Value": "true"}],
+            }
+            for n in range(1, 121)
+        ] + [
+            {
+                "ResourceARN": "arn:aws:ecs:us-east-1:123456789012:service/my-cluster/my-service",
+                "Tags": [{"Key": "Role", "Value": "web"}],
+            }
+        ]
     
     def client(self, service_name: str, region_name: str = "us-east-1"):
         if service_name == "autoscaling":
@@ -13,7 +34,9 @@ class MockBoto3:
         elif service_name == "ecs":
             return MockECS(self._ecs_state)
         elif service_name == "ssm":
-            return MockSSM()
+            return MockSSM(self._ssm_state)
+        elif service_name == "resourcegroupstaggingapi":
+            return MockResourceGroupsTagging(self._tagged_resources)
         else:
             raise NotImplementedError(f"Mock for {service_name} not implemented")
 
@@ -45,6 +68,18 @@ class MockECS:
     def __init__(self, state):
         self.state = state
 
+    def describe_services(self, cluster: str, services: List[str]):
+        if len(services) > 10:
+            raise ValueError("DescribeServices accepts at most 10 services")
+        found, failures = [], []
+        for service in services:
+            key = f"{cluster}/{service}"
+            if key in self.state:
+                found.append({"serviceName": service, "desiredCount": self.state[key]["desiredCount"]})
+            else:
+                failures.append({"arn": service, "reason": "MISSING"})
+        return {"services": found, "failures": failures}
+
     def update_service(self, cluster: str, service: str, desiredCount: int):
         key = f"{cluster}/{service}"
         if key in self.state:
@@ -52,9 +87,43 @@ class MockECS:
         return {}
 
 class MockSSM:
-    def send_command(self, InstanceIds: List[str], DocumentName: str, Parameters: Dict):
-        # Always return success with a fake CommandId
-        return {"Command": {"CommandId": "mock-command-id-12345"}}
+    _ids = itertools.count(1)
+
+    def __init__(self, state):
+        self.state = state
+
+    def send_command(self, InstanceIds: List[str], DocumentName: str, Parameters: Dict, **kwargs):
+        if len(InstanceIds) > 50:
+            raise ValueError("SendCommand accepts at most 50 InstanceIds")
+        # Every invocation succeeds immediately
+        with self.state["lock"]:
+            command_id = f"mock-command-id-{next(self._ids):05d}"
+            self.state["commands"][command_id] = {i: "Success" for i in InstanceIds}
+        return {"Command": {"CommandId": command_id, "TargetCount": len(InstanceIds)}}
+
+    def list_command_invocations(self, CommandId: str, **kwargs):
+        invocations = self.state["commands"].get(CommandId, {})
+        return {"CommandInvocations": [
+            {"CommandId": CommandId, "InstanceId": i, "Status": status}
+            for i, status in invocations.items()
+        ]}
+
+class MockResourceGroupsTagging:
+    def __init__(self, resources):
+        self.resources = resources
+
+    def get_resources(self, TagFilters: List[Dict[str, Any]], ResourceTypeFilters: List[str], PaginationToken: str = ""):
+        # ResourceTypeFilters look like "ec2:instance" -> "arn:aws:ec2:...:instance/..."
+        matched = []
+        for res in self.resources:
+            parts = res["ResourceARN"].split(":", 5)
+            resource_type = f"{parts[2]}:{parts[5].split('/')[0]}"
+            if resource_type not in ResourceTypeFilters:
+                continue
+            tags = {t["Key"]: t["Value"] for t in res["Tags"]}
+            if all(tags.get(f["Key"]) in f["Values"] for f in TagFilters):
+                matched.append(res)
+        return {"ResourceTagMappingList": matched, "PaginationToken": ""}
 
 # Global singleton
 mock_boto3 = MockBoto3()
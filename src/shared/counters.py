@@ -0,0 +1,58 @@
+import math
+from typing import Any, Dict, Optional, Tuple
+
+# Buckets per sliding window: 60 buckets = 1 minute resolution on a 1 hour window
+DEFAULT_BUCKETS = 60
+
+def new_window(buckets: int = DEFAULT_BUCKETS) -> Dict[str, Any]:
+    return {"buckets": [0] * buckets, "head": 0, "total": 0}
+
+def _advance(state: Dict[str, Any], bucket_idx: int):
+    """
+    Moves the ring head to bucket_idx, expiring the buckets that fell out of the window.
+    Touches at most len(buckets) slots, independent of how many events were counted.
+    """
+    size = len(state["buckets"])
+    gap = bucket_idx - state["head"]
+    if gap <= 0:
+        return  # Same bucket (or clock skew): count into the current head
+    if gap >= size:
+        state["buckets"] = [0] * size
+        state["total"] = 0
+    else:
+        for i in range(1, gap + 1):
+            slot = (state["head"] + i) % size
+            state["total"] -= state["buckets"][slot]
+            state["buckets"][slot] = 0
+    state["head"] = bucket_idx
+
+def try_add(state: Optional[Dict[str, Any]], limit: int, window_seconds: float, now: float,
+            amount: int = 1, buckets: int = DEFAULT_BUCKETS) -> Tuple[bool, Dict[str, Any]]:
+    """
+    Sliding-window check-and-increment on a bucketed ring counter.
+    Returns (allowed, new_state); the count is only added when allowed.
+    """
+    if state is None or len(state["buckets"]) != buckets:
+        state = new_window(buckets)
+    else:
+        state = {"buckets": list(state["buckets"]), "head": state["head"], "total": state["total"]}
+    bucket_idx = math.floor(now / (window_seconds / buckets))
+    _advance(state, bucket_idx)
+    if state["total"] + amount > limit:
+        return False, state
+    state["buckets"][bucket_idx % buckets] += amount
+    state["total"] += amount
+    return True, state
+
+def try_increment(current: Any, limit: int, window_seconds: Optional[float], now: float,
+                  amount: int = 1) -> Tuple[bool, Any]:
+    """
+    Check-and-increment on a stored counter value: a plain count without window_seconds,
+    otherwise a sliding window. Returns (allowed, new_value).
+    """
+    if window_seconds is None:
+        count = current or 0
+        if count + amount > limit:
+            return False, count
+        return True, count + amount
+    return try_add(current, limit, window_seconds, now, amount)
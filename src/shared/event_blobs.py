@@ -0,0 +1,46 @@
+import copy
+import hashlib
+import json
+import zlib
+from typing import Any, Dict, Tuple
+
+# Fields that change on every alarm transition. They stay inline on the incident
+# (the "envelope"); everything else is the stable part that gets deduplicated.
+VOLATILE_KEYS = ("id", "time")
+VOLATILE_DETAIL_KEYS = ("state", "previousState")
+
+def split_event(event: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Splits a CloudWatch event into (stable payload, volatile envelope)."""
+    stable = copy.deepcopy(event)
+    envelope: Dict[str, Any] = {}
+    for key in VOLATILE_KEYS:
+        if key in stable:
+            envelope[key] = stable.pop(key)
+    detail = stable.get("detail")
+    if isinstance(detail, dict):
+        for key in VOLATILE_DETAIL_KEYS:
+            if key in detail:
+                envelope.setdefault("detail", {})[key] = detail.pop(key)
+    return stable, envelope
+
+def merge_event(stable: Dict[str, Any], envelope: Dict[str, Any]) -> Dict[str, Any]:
+    """Inverse of split_event."""
+    event = copy.deepcopy(stable)
+    for key, value in envelope.items():
+        if key == "detail":
+            event.setdefault("detail", {}).update(value)
+        else:
+            event[key] = value
+    return event
+
+def _canonical(payload: Dict[str, Any]) -> bytes:
+    return json.dumps(payload, sort_keys=True, separators=(",", ":")).encode()
+
+def content_hash(payload: Dict[str, Any]) -> str:
+    return hashlib.sha256(_canonical(payload)).hexdigest()
+
+def compress(payload: Dict[str, Any]) -> bytes:
+    return zlib.compress(_canonical(payload), 6)
+
+def decompress(blob: bytes) -> Dict[str, Any]:
+    return json.loads(zlib.decompress(blob))
@@ -0,0 +1,32 @@
+import threading
+from typing import Any, Callable
+
+class LazyObject:
+    """
+    Module-level singleton whose construction (and the imports it needs) waits for
+    first use. Attribute access is forwarded to the object built by `factory`.
+    """
+    def __init__(self, factory: Callable[[], Any]):
+        object.__setattr__(self, "_factory", factory)
+        object.__setattr__(self, "_target", None)
+        object.__setattr__(self, "_lock", threading.Lock())
+
+    def _resolve(self) -> Any:
+        target = self._target
+        if target is None:
+            with self._lock:
+                target = self._target
+                if target is None:
+                    target = self._factory()
+                    object.__setattr__(self, "_target", target)
+        return target
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._resolve(), name)
+
+    def __setattr__(self, name: str, value: Any):
+        setattr(self._resolve(), name, value)
+
+    @property
+    def initialized(self) -> bool:
+        return self._target is not None
@@ -0,0 +1,86 @@
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from src.shared.storage import db
+from src.actions.common import as_list
+
+# Which action params identify the resources an action touches (single id and/or list)
+RESOURCE_PARAMS = {
+    "scale_asg": ("asg_name",),
+    "ssm_restart_service": ("instance_id", "instance_ids"),
+    "scale_ecs_service": ("service", "services"),
+    "rollback_deployment": ("target_id",),
+}
+
+# Tag selector param of fan-out actions; its targets are only known once the action runs
+SELECTOR_PARAM = "targets"
+
+def action_resources(action: Dict[str, Any]) -> List[str]:
+    """Distinct resource ids named in an action's params, in order."""
+    params = action.get("params") or {}
+    resources: List[str] = []
+    for name in RESOURCE_PARAMS.get(action["type"], ()):
+        resources += as_list(params.get(name))
+    return list(dict.fromkeys(resources))
+
+class BlastRadiusGuard:
+    """
+    Enforces runbook safety limits before an action runs:
+      max_per_incident: 1                                  # runs of this action per incident
+      max_per_resource: {limit: 3, window_seconds: 3600}   # per resource, sliding window
+      max_global: {limit: 5, window_seconds: 3600}         # per action type, fleet-wide
+    Each limit is one counter check-and-increment in storage, so the cost does not
+    depend on how much action history exists. All of an action's limits are reserved
+    in one storage transaction. A fan-out action counts once per target against
+    max_per_resource and max_global; a tag selector cannot be counted up front, so
+    actions declaring those limits must list their targets explicitly.
+    """
+    def __init__(self, storage):
+        self.storage = storage
+
+    def _limits(self, incident_id: str, action: Dict[str, Any]) -> List[Tuple[str, str, int, Optional[float], int]]:
+        """(name, counter key, limit, window, amount) for every limit the action declares."""
+        safety = action.get("sanity_checks") or {}
+        limits: List[Tuple[str, str, int, Optional[float], int]] = []
+        if "max_per_incident" in safety:
+            limits.append(("max_per_incident", f"incident#{incident_id}#{action['id']}",
+                           int(safety["max_per_incident"]), None, 1))
+        resources = action_resources(action)
+        if "max_per_resource" in safety:
+            rule = safety["max_per_resource"]
+            window = float(rule["window_seconds"])
+            for resource in resources:
+                limits.append(("max_per_resource", f"resource#{action['type']}#{resource}#{int(window)}",
+                               int(rule["limit"]), window, 1))
+        if "max_global" in safety:
+            rule = safety["max_global"]
+            window = float(rule["window_seconds"])
+            limits.append(("max_global", f"global#{action['type']}#{int(window)}", int(rule["limit"]), window,
+                           max(len(resources), 1)))
+        return limits
+
+    def reserve(self, incident_id: str, action: Dict[str, Any], now: Optional[float] = None) -> Optional[str]:
+        """
+        Counts one execution of action against every limit it declares, all in one
+        storage transaction. Returns None if allowed, otherwise a description of the
+        exceeded limit (and nothing is counted).
+        """
+        now = time.time() if now is None else now
+        safety = action.get("sanity_checks") or {}
+        counted = [name for name in ("max_per_resource", "max_global") if name in safety]
+        if counted and (action.get("params") or {}).get(SELECTOR_PARAM):
+            return f"{counted[0]} cannot be enforced on a tag selector: list the targets explicitly"
+
+        limits = self._limits(incident_id, action)
+        if not limits:
+            return None
+        # One storage transaction for all of them: nothing to give back on rejection
+        failed = self.storage.increment_counters([(key, limit, window, amount)
+                                                  for _, key, limit, window, amount in limits], now)
+        if failed is None:
+            return None
+        name, _, limit, window, _ = limits[failed]
+        per = f" per {int(window)}s" if window else ""
+        return f"{name} exceeded: limit {limit}{per}"
+
+# Singleton
+blast_radius = BlastRadiusGuard(db)
@@ -7,6 +7,7 @@ import uuid
 class IncidentState(str, Enum):
     OPEN = "OPEN"
     MITIGATING = "MITIGATING"
+    EXECUTING = "EXECUTING"  # claimed by one executor; no other executor may start it
     RESOLVED = "RESOLVED"
     FAILED = "FAILED"
 
@@ -24,7 +25,17 @@ class Incident(BaseModel):
     summary: str
     created_at: str = Field(default_factory=lambda: datetime.utcnow().isoformat())
     resolved_at: Optional[str] = None
+    runbook_id: Optional[str] = None
+    # Set by the executor that claimed the incident (EXECUTING); a stale claim can be taken over
+    claimed_by: Optional[str] = None
+    claimed_at: Optional[str] = None
+    # Raw event is stored once per content hash (event_ref) and only loaded on demand;
+    # event_envelope keeps the per-transition fields (id, time, state) inline
     cloudwatch_event: Dict[str, Any] = Field(default_factory=dict)
+    event_ref: Optional[str] = None
+    event_envelope: Dict[str, Any] = Field(default_factory=dict)
+    # Bumped on every write; conditional writes compare it to detect lost updates
+    version: int = 0
 
 class RemediationPlan(BaseModel):
     incident_id: str
@@ -43,6 +54,7 @@ class ActionStatus(str, Enum):
 class ActionLog(BaseModel):
     incident_id: str
     action_id: str
+    action_type: Optional[str] = None
     timestamp: str = Field(default_factory=lambda: datetime.utcnow().isoformat())
     status: ActionStatus
     details: Dict[str, Any] = Field(default_factory=dict)
@@ -0,0 +1,158 @@
+import functools
+import os
+import threading
+from contextlib import nullcontext
+from typing import Any, Dict, List, Optional
+
+# Pipeline stages that can be profiled separately
+STAGES = ["simulation", "ingest", "plan", "runbook_match", "param_resolution", "storage_io", "execute", "action_execution"]
+
+_NULL_STAGE = nullcontext()
+
+class _Stage:
+    def __init__(self, profiler: 'StageProfiler', name: str):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.profiler._push(self.name)
+
+    def __exit__(self, *exc):
+        self.profiler._pop()
+        return False
+
+class StageProfiler:
+    """
+    cProfile scoped to pipeline stages.
+    Each stage gets its own Profile; entering a nested stage pauses the outer one,
+    so every function's self time is attributed to the innermost stage.
+    Only the thread that called start() is profiled (cProfile is per-thread).
+    """
+    def __init__(self):
+        self.enabled = False
+        self.profiles: Dict[str, Any] = {}
+        self._stack: List[str] = []
+        self._thread: Optional[int] = None
+
+    def start(self):
+        self.enabled = True
+        self.profiles = {}
+        self._stack = []
+        self._thread = threading.get_ident()
+
+    def stop(self):
+        while self._stack:
+            self._pop()
+        self.enabled = False
+
+    def stage(self, name: str):
+        if not self.enabled or threading.get_ident() != self._thread:
+            return _NULL_STAGE
+        return _Stage(self, name)
+
+    def _push(self, name: str):
+        import cProfile
+        if self._stack:
+            self.profiles[self._stack[-1]].disable()
+        self._stack.append(name)
+        self.profiles.setdefault(name, cProfile.Profile()).enable()
+
+    def _pop(self):
+        name = self._stack.pop()
+        self.profiles[name].disable()
+        if self._stack:
+            self.profiles[self._stack[-1]].enable()
+
+    # --- Reports ---
+    def _stats(self, name: str) -> Dict:
+        prof = self.profiles[name]
+        prof.create_stats()  # what pstats.Stats(prof) does, but keeps the typed stats dict
+        stats = prof.stats
+        # Hide the profiler's own stage bookkeeping
+        return {f: v for f, v in stats.items() if f[0] != __file__}
+
+    def summary(self, top: int = 10) -> Dict[str, Dict[str, Any]]:
+        """Per stage: total self time and the top functions ranked by self time."""
+        report = {}
+        for name in self.profiles:
+            stats = self._stats(name)
+            rows = sorted(
+                ({"function": _label(f), "calls": nc, "tottime": tt, "cumtime": ct}
+                 for f, (cc, nc, tt, ct, callers) in stats.items()),
+                key=lambda r: r["tottime"], reverse=True
+            )
+            report[name] = {
+                "total_seconds": sum(r["tottime"] for r in rows),
+                "top": rows[:top]
+            }
+        return report
+
+    def collapsed_stacks(self) -> List[str]:
+        """
+        Folded stacks ("stage;caller;callee <microseconds>") for flamegraph.pl / speedscope.
+        cProfile only records caller->callee edges, so each function's self time is split
+        across call paths in proportion to the time spent on each edge.
+        """
+        lines = []
+        for name in self.profiles:
+            stats = self._stats(name)
+            callees: Dict[Any, Dict[Any, float]] = {}
+            for func, (cc, nc, tt, ct, callers) in stats.items():
+                for caller, edge in callers.items():
+                    callees.setdefault(caller, {})[func] = edge[3]
+            roots = [f for f, v in stats.items() if not any(c in stats for c in v[4])]
+            folded: Dict[str, float] = {}
+            for root in roots:
+                _fold(stats, callees, root, [name], 1.0, folded)
+            lines += [f"{path} {int(us)}" for path, us in folded.items() if us >= 1]
+        return lines
+
+    def write(self, out_dir: str) -> Dict[str, str]:
+        """Dumps one .pstats file per stage plus stacks.collapsed for all stages."""
+        os.makedirs(out_dir, exist_ok=True)
+        paths = {}
+        for name, prof in self.profiles.items():
+            paths[name] = os.path.join(out_dir, f"{name}.pstats")
+            prof.dump_stats(paths[name])
+        paths["collapsed"] = os.path.join(out_dir, "stacks.collapsed")
+        with open(paths["collapsed"], 'w') as f:
+            f.write("\n".join(self.collapsed_stacks()) + "\n")
+        return paths
+
+def _label(func) -> str:
+    filename, lineno, fn = func
+    if filename == "~":
+        return fn  # builtins, e.g. <built-in method io.open>
+    return f"{os.path.basename(filename)}:{fn}"
+
+def _fold(stats, callees, func, path: List[str], share: float, out: Dict[str, float], depth: int = 0):
+    label = _label(func)
+    path = path + [label]
+    self_us = stats[func][2] * share * 1e6
+    if self_us > 0:
+        key = ";".join(path)
+        out[key] = out.get(key, 0.0) + self_us
+    if depth > 64:
+        return
+    for callee, edge_ct in callees.get(func, {}).items():
+        ct = stats[callee][3]
+        if ct <= 0 or _label(callee) in path:  # cut recursion
+            continue
+        _fold(stats, callees, callee, path, share * edge_ct / ct, out, depth + 1)
+
+# Global profiler; disabled unless a CLI --profile flag turns it on
+profiler = StageProfiler()
+
+def stage(name: str):
+    """Context manager marking a pipeline stage; a no-op unless profiling is on."""
+    return profiler.stage(name)
+
+def profiled(name: str):
+    """Decorator variant of stage() for whole functions/methods."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with profiler.stage(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
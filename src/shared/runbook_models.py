@@ -1,6 +1,5 @@
 from typing import List, Dict, Optional, Any
-from pydantic import BaseModel, Field, validator
-import yaml
+from pydantic import BaseModel, Field, validator, model_validator
 import os
 
 class ActionDef(BaseModel):
@@ -9,6 +8,15 @@ class ActionDef(BaseModel):
     params: Dict[str, Any]
     safety: Dict[str, Any] = Field(default_factory=dict)
 
+    @model_validator(mode="after")
+    def check_action(self) -> 'ActionDef':
+        # Unknown actions / bad params fail when the runbook loads, not mid-incident
+        from src.actions.registry import registry
+        errors = registry.validate(self.type, self.params)
+        if errors:
+            raise ValueError(f"action '{self.id}': " + "; ".join(errors))
+        return self
+
 class MatchCriteria(BaseModel):
     alarm_name_prefix: Optional[str] = None
     namespace: Optional[str] = None
@@ -21,6 +29,7 @@ class Runbook(BaseModel):
 
     @classmethod
     def load_from_file(cls, filepath: str) -> 'Runbook':
+        import yaml  # only needed when reading YAML, not when planning from a compiled bundle
         with open(filepath, 'r') as f:
             data = yaml.safe_load(f)
         return cls(**data)
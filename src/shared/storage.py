@@ -1,17 +1,126 @@
+import fcntl
+import hashlib
 import json
 import os
-from typing import List, Optional, Dict, Any
-from .models import Incident, RemediationPlan, ActionLog
+import threading
+import time
+from contextlib import contextmanager
+from functools import cached_property
+from decimal import Decimal
+from typing import List, Optional, Dict, Any, Callable, Iterator, Tuple
+from .models import Incident, IncidentState, RemediationPlan, ActionLog
+from .profiling import profiled
+from . import event_blobs, counters
+from .lazy import LazyObject
 
 # Local file storage for simulation
 DB_DIR = os.path.join(os.getcwd(), ".rr_db")
 
+# How long SQLiteStorage waits on another process's lock before giving up, and its retry backoff
+SQLITE_BUSY_TIMEOUT_SECONDS = 60
+SQLITE_RETRY_MIN_SECONDS = 0.00005
+SQLITE_RETRY_MAX_SECONDS = 0.002
+
+# How long idle per-incident counters are kept (DynamoDB TTL)
+COUNTER_TTL_SECONDS = 30 * 86400
+COUNTER_MAX_RETRIES = 5
+
+# DynamoDB limit on items per TransactWriteItems call
+MAX_TRANSACTION_ITEMS = 100
+
+# Attributes streamed out for analytics (rr stats)
+INCIDENT_STAT_FIELDS = ("incident_id", "alarm_name", "state", "runbook_id", "created_at", "resolved_at")
+ACTION_STAT_FIELDS = ("incident_id", "action_id", "action_type", "status", "timestamp")
+
+# (counter key, limit, window_seconds or None for a plain count, amount)
+CounterRequest = Tuple[str, int, Optional[float], int]
+
+class StateConflictError(RuntimeError):
+    """A conditional incident write lost against a concurrent update."""
+
+class UnitOfWork:
+    """
+    Groups related writes so they commit together or not at all, e.g.:
+
+        with db.transaction() as tx:
+            tx.save_plan(plan)
+            tx.save_incident(incident, expected_state=IncidentState.OPEN)
+
+    Incident writes are conditional on the version the incident was read at, and
+    optionally on its stored state; a failed condition raises StateConflictError
+    and nothing is written.
+    """
+    def __init__(self, storage):
+        self.storage = storage
+        self.ops: List[Tuple[str, Any, Optional[IncidentState]]] = []
+
+    def save_incident(self, incident: Incident, expected_state: Optional[IncidentState] = None):
+        self.ops.append(("incident", incident, expected_state))
+
+    def save_plan(self, plan: RemediationPlan):
+        self.ops.append(("plan", plan, None))
+
+    def log_action(self, log: ActionLog):
+        self.ops.append(("action", log, None))
+
+    def __enter__(self) -> 'UnitOfWork':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None and self.ops:
+            self.storage._commit(self.ops)
+        return False
+
+def _committed(ops):
+    # Stored versions moved forward; keep the in-memory incidents in step
+    for kind, obj, _ in ops:
+        if kind == "incident":
+            obj.version += 1
+
+def _incident_item(incident: Incident, put_blob: Callable[[str, bytes], None]) -> Dict[str, Any]:
+    """
+    Serializes an incident without its raw event.
+    A newly attached event is split, and its stable part is written to the blob store
+    under its content hash; repeated alarms reference the same blob.
+    """
+    if incident.cloudwatch_event and not incident.event_ref:
+        stable, envelope = event_blobs.split_event(incident.cloudwatch_event)
+        incident.event_ref = event_blobs.content_hash(stable)
+        incident.event_envelope = envelope
+        put_blob(incident.event_ref, event_blobs.compress(stable))
+    if incident.event_ref:
+        item = incident.model_dump(mode="json", exclude={"cloudwatch_event"})
+    else:
+        item = incident.model_dump(mode="json")
+    item["version"] = incident.version + 1
+    return item
+
+def _check_incident(stored: Optional[Dict[str, Any]], incident: Incident, expected_state: Optional[IncidentState]):
+    stored_version = stored.get("version", 0) if stored else 0
+    if stored_version != incident.version:
+        raise StateConflictError(
+            f"Incident {incident.incident_id} changed concurrently (version {stored_version}, expected {incident.version})")
+    if expected_state and (not stored or IncidentState(stored["state"]) != expected_state):
+        state = stored["state"] if stored else None
+        raise StateConflictError(
+            f"Incident {incident.incident_id} is {state}, expected {expected_state.value}")
+
+def _to_ddb(item: Dict[str, Any]) -> Dict[str, Any]:
+    # DynamoDB rejects floats and enums; round-trip through JSON with Decimal numbers
+    return json.loads(json.dumps(item, default=str), parse_float=Decimal)
+
 class LocalStorage:
-    def __init__(self):
-        os.makedirs(DB_DIR, exist_ok=True)
-        self.incidents_file = os.path.join(DB_DIR, "incidents.json")
-        self.plans_file = os.path.join(DB_DIR, "plans.json")
-        self.actions_file = os.path.join(DB_DIR, "actions.json")
+    def __init__(self, db_dir: Optional[str] = None):
+        db_dir = db_dir or DB_DIR
+        os.makedirs(db_dir, exist_ok=True)
+        self.incidents_file = os.path.join(db_dir, "incidents.json")
+        self.plans_file = os.path.join(db_dir, "plans.json")
+        self.actions_file = os.path.join(db_dir, "actions.json")
+        self.counters_dir = os.path.join(db_dir, "counters")
+        self.events_dir = os.path.join(db_dir, "events")
+        self.lock_file = os.path.join(db_dir, ".lock")
+        os.makedirs(self.events_dir, exist_ok=True)
+        os.makedirs(self.counters_dir, exist_ok=True)
         self._init_files()
 
     def _init_files(self):
@@ -25,31 +134,97 @@ class LocalStorage:
             return json.load(f)
 
     def _write_json(self, filepath: str, data: Dict[str, Any]):
-        with open(filepath, 'w') as f:
+        # Replace atomically so readers never see a half-written file
+        tmp = f"{filepath}.{os.getpid()}.tmp"
+        with open(tmp, 'w') as f:
             json.dump(data, f, indent=2)
+        os.replace(tmp, filepath)
+
+    @contextmanager
+    def _locked(self):
+        """Exclusive lock over the whole local DB for read-check-write sequences."""
+        with open(self.lock_file, 'a') as fh:
+            fcntl.flock(fh, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(fh, fcntl.LOCK_UN)
+
+    def transaction(self) -> UnitOfWork:
+        return UnitOfWork(self)
+
+    @profiled("storage_io")
+    def _commit(self, ops):
+        """Checks every condition, then applies all writes, under one lock."""
+        with self._locked():
+            files: Dict[str, Dict[str, Any]] = {}
+
+            def load(path):
+                if path not in files:
+                    files[path] = self._read_json(path)
+                return files[path]
+
+            for kind, obj, expected_state in ops:
+                if kind == "incident":
+                    _check_incident(load(self.incidents_file).get(obj.incident_id), obj, expected_state)
+
+            for kind, obj, _ in ops:
+                if kind == "incident":
+                    load(self.incidents_file)[obj.incident_id] = _incident_item(obj, self._put_blob)
+                elif kind == "plan":
+                    load(self.plans_file)[obj.incident_id] = obj.model_dump(mode="json")
+                else:
+                    load(self.actions_file).setdefault(obj.incident_id, []).append(obj.model_dump(mode="json"))
+
+            for path, data in files.items():
+                self._write_json(path, data)
+        _committed(ops)
+
+    def _blob_path(self, event_ref: str) -> str:
+        return os.path.join(self.events_dir, f"{event_ref}.json.z")
+
+    def _put_blob(self, event_ref: str, blob: bytes):
+        path = self._blob_path(event_ref)
+        if os.path.exists(path):
+            return  # Content-addressed: already stored
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, 'wb') as f:
+            f.write(blob)
+        os.replace(tmp, path)
 
     # --- Incidents ---
-    def save_incident(self, incident: Incident):
-        data = self._read_json(self.incidents_file)
-        data[incident.incident_id] = incident.model_dump()
-        self._write_json(self.incidents_file, data)
+    def save_incident(self, incident: Incident, expected_state: Optional[IncidentState] = None):
+        self._commit([("incident", incident, expected_state)])
 
-    def get_incident(self, incident_id: str) -> Optional[Incident]:
+    @profiled("storage_io")
+    def get_incident(self, incident_id: str, include_event: bool = False) -> Optional[Incident]:
         data = self._read_json(self.incidents_file)
         if incident_id in data:
-            return Incident(**data[incident_id])
+            incident = Incident(**data[incident_id])
+            if include_event and incident.event_ref:
+                incident.cloudwatch_event = self.get_event(incident)
+            return incident
         return None
 
+    @profiled("storage_io")
+    def get_event(self, incident: Incident) -> Dict[str, Any]:
+        """Loads the raw CloudWatch event for an incident from the blob store."""
+        if not incident.event_ref:
+            return incident.cloudwatch_event
+        with open(self._blob_path(incident.event_ref), 'rb') as f:
+            stable = event_blobs.decompress(f.read())
+        return event_blobs.merge_event(stable, incident.event_envelope)
+
+    @profiled("storage_io")
     def list_incidents(self) -> List[Incident]:
         data = self._read_json(self.incidents_file)
         return [Incident(**v) for v in data.values()]
 
     # --- Plans ---
     def save_plan(self, plan: RemediationPlan):
-        data = self._read_json(self.plans_file)
-        data[plan.incident_id] = plan.model_dump()
-        self._write_json(self.plans_file, data)
+        self._commit([("plan", plan, None)])
     
+    @profiled("storage_io")
     def get_plan(self, incident_id: str) -> Optional[RemediationPlan]:
         data = self._read_json(self.plans_file)
         if incident_id in data:
@@ -58,29 +233,369 @@ class LocalStorage:
 
     # --- Actions ---
     def log_action(self, log: ActionLog):
-        data = self._read_json(self.actions_file)
-        if log.incident_id not in data:
-            data[log.incident_id] = []
-        data[log.incident_id].append(log.model_dump())
-        self._write_json(self.actions_file, data)
+        self._commit([("action", log, None)])
+
+    # --- Analytics ---
+    def iter_incident_items(self) -> Iterator[Dict[str, Any]]:
+        """Raw incident items (no model validation), for bulk analytics."""
+        yield from self._read_json(self.incidents_file).values()
+
+    def iter_action_items(self) -> Iterator[Dict[str, Any]]:
+        for logs in self._read_json(self.actions_file).values():
+            yield from logs
+
+    # --- Counters ---
+    def _counter_path(self, key: str) -> str:
+        # One small file per counter: a check never reads or rewrites the other counters
+        return os.path.join(self.counters_dir, f"{hashlib.sha256(key.encode()).hexdigest()[:32]}.json")
+
+    def increment_counter(self, key: str, limit: int, window_seconds: Optional[float] = None,
+                          now: Optional[float] = None, amount: int = 1) -> bool:
+        """
+        Adds amount to a counter unless that would exceed limit.
+        Without window_seconds it is a plain counter, otherwise a sliding window.
+        """
+        return self.increment_counters([(key, limit, window_seconds, amount)], now) is None
+
+    @profiled("storage_io")
+    def increment_counters(self, requests: List[CounterRequest], now: Optional[float] = None) -> Optional[int]:
+        """
+        Applies several (key, limit, window_seconds, amount) increments together, or none.
+        Returns None when all were applied, else the index of the first that would exceed its limit.
+        """
+        now = time.time() if now is None else now
+        with self._locked():
+            staged: Dict[str, Any] = {}
+            for n, (key, limit, window_seconds, amount) in enumerate(requests):
+                if key in staged:
+                    current = staged[key]
+                else:
+                    path = self._counter_path(key)
+                    current = self._read_json(path)["value"] if os.path.exists(path) else None
+                allowed, staged[key] = counters.try_increment(current, limit, window_seconds, now, amount)
+                if not allowed:
+                    return n
+            for key, value in staged.items():
+                self._write_json(self._counter_path(key), {"key": key, "value": value})
+        return None
+
+class SQLiteStorage:
+    """
+    SQLite backend (WAL mode) for many local processes writing at once, e.g. the sharded
+    simulator. Every write is one short IMMEDIATE transaction whose cost does not grow with
+    the amount of data (LocalStorage rewrites whole JSON files).
+    Select it with RR_STORAGE=sqlite; RR_DB_PATH overrides the file location.
+    Blast-radius counters live in a second file next to it (<name>.counters.sqlite), so
+    limit reservations take a different write lock from incident, plan and action writes.
+    """
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS incidents (incident_id TEXT PRIMARY KEY, version INTEGER NOT NULL, state TEXT NOT NULL, item TEXT NOT NULL)",
+        "CREATE TABLE IF NOT EXISTS plans (incident_id TEXT PRIMARY KEY, item TEXT NOT NULL)",
+        "CREATE TABLE IF NOT EXISTS actions (seq INTEGER PRIMARY KEY AUTOINCREMENT, incident_id TEXT NOT NULL, item TEXT NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS actions_by_incident ON actions (incident_id)",
+        "CREATE TABLE IF NOT EXISTS events (event_hash TEXT PRIMARY KEY, payload BLOB NOT NULL)",
+    )
+    COUNTERS_SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS counters (counter_key TEXT PRIMARY KEY, value TEXT NOT NULL)",
+    )
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.environ.get("RR_DB_PATH") or os.path.join(DB_DIR, "ranger.sqlite")
+        self.counters_path = os.path.splitext(self.path)[0] + ".counters.sqlite"
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._local = threading.local()
+        for path, schema in ((self.path, self.SCHEMA), (self.counters_path, self.COUNTERS_SCHEMA)):
+            self._execute("PRAGMA journal_mode=WAL", path=path)
+            with self._write(path) as conn:
+                for statement in schema:
+                    conn.execute(statement)
+
+    def _conn(self, path: Optional[str] = None):
+        # One connection per file, process and thread; never reuse one across fork()
+        path = path or self.path
+        if getattr(self._local, "pid", None) != os.getpid():
+            self._local.conns, self._local.pid = {}, os.getpid()
+        conn = self._local.conns.get(path)
+        if conn is None:
+            import sqlite3
+            # timeout=0: SQLite's own busy handler sleeps in >= 1ms steps, far longer than our
+            # transactions, so waits go through _execute's short backoff instead
+            conn = sqlite3.connect(path, timeout=0, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conns[path] = conn
+        return conn
+
+    def _execute(self, sql: str, params: Tuple = (), path: Optional[str] = None):
+        """Runs a statement, retrying while another process holds a conflicting lock."""
+        import sqlite3
+        conn = self._conn(path)
+        delay, deadline = SQLITE_RETRY_MIN_SECONDS, time.monotonic() + SQLITE_BUSY_TIMEOUT_SECONDS
+        while True:
+            try:
+                return conn.execute(sql, params)
+            except sqlite3.OperationalError as e:
+                if "locked" not in str(e) or time.monotonic() > deadline:
+                    raise
+                time.sleep(delay)
+                delay = min(delay * 2, SQLITE_RETRY_MAX_SECONDS)
+
+    @contextmanager
+    def _write(self, path: Optional[str] = None):
+        """Takes the database write lock up front, so read-check-write sequences cannot interleave."""
+        self._execute("BEGIN IMMEDIATE", path=path)
+        conn = self._conn(path)
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def transaction(self) -> UnitOfWork:
+        return UnitOfWork(self)
+
+    @profiled("storage_io")
+    def _commit(self, ops):
+        # Serialize before taking the write lock; other processes only wait for the SQL itself.
+        # Incidents are serialized from a copy, so a rejected commit leaves the caller's object untouched.
+        blobs: Dict[str, bytes] = {}
+        rows = []
+        for kind, obj, expected_state in ops:
+            if kind == "incident":
+                staged = obj.model_copy()
+                rows.append((kind, obj, expected_state, staged, json.dumps(_incident_item(staged, blobs.__setitem__))))
+            else:
+                rows.append((kind, obj, expected_state, None, obj.model_dump_json()))
+
+        with self._write() as conn:
+            for kind, obj, expected_state, _, _ in rows:
+                if kind == "incident":
+                    row = conn.execute("SELECT version, state FROM incidents WHERE incident_id = ?",
+                                       (obj.incident_id,)).fetchone()
+                    _check_incident({"version": row[0], "state": row[1]} if row else None, obj, expected_state)
+            if blobs:
+                conn.executemany("INSERT OR IGNORE INTO events (event_hash, payload) VALUES (?, ?)", blobs.items())
+            for kind, obj, _, staged, item in rows:
+                if kind == "incident":
+                    # Upsert keeps the rowid, so list_incidents stays in creation order
+                    conn.execute(
+                        "INSERT INTO incidents (incident_id, version, state, item) VALUES (?, ?, ?, ?) "
+                        "ON CONFLICT(incident_id) DO UPDATE SET version = excluded.version, "
+                        "state = excluded.state, item = excluded.item",
+                        (obj.incident_id, obj.version + 1, staged.state.value, item))
+                elif kind == "plan":
+                    conn.execute("INSERT OR REPLACE INTO plans (incident_id, item) VALUES (?, ?)", (obj.incident_id, item))
+                else:
+                    conn.execute("INSERT INTO actions (incident_id, item) VALUES (?, ?)", (obj.incident_id, item))
+        for kind, obj, _, staged, _ in rows:
+            if kind == "incident":
+                obj.event_ref, obj.event_envelope = staged.event_ref, staged.event_envelope
+        _committed(ops)
+
+    # --- Incidents ---
+    def save_incident(self, incident: Incident, expected_state: Optional[IncidentState] = None):
+        self._commit([("incident", incident, expected_state)])
+
+    @profiled("storage_io")
+    def get_incident(self, incident_id: str, include_event: bool = False) -> Optional[Incident]:
+        row = self._execute("SELECT item FROM incidents WHERE incident_id = ?", (incident_id,)).fetchone()
+        if not row:
+            return None
+        incident = Incident(**json.loads(row[0]))
+        if include_event and incident.event_ref:
+            incident.cloudwatch_event = self.get_event(incident)
+        return incident
+
+    @profiled("storage_io")
+    def get_event(self, incident: Incident) -> Dict[str, Any]:
+        """Loads the raw CloudWatch event for an incident from the blob table."""
+        if not incident.event_ref:
+            return incident.cloudwatch_event
+        row = self._execute("SELECT payload FROM events WHERE event_hash = ?", (incident.event_ref,)).fetchone()
+        return event_blobs.merge_event(event_blobs.decompress(row[0]), incident.event_envelope)
+
+    @profiled("storage_io")
+    def list_incidents(self) -> List[Incident]:
+        return [Incident(**item) for item in self.iter_incident_items()]
+
+    # --- Plans ---
+    def save_plan(self, plan: RemediationPlan):
+        self._commit([("plan", plan, None)])
+
+    @profiled("storage_io")
+    def get_plan(self, incident_id: str) -> Optional[RemediationPlan]:
+        row = self._execute("SELECT item FROM plans WHERE incident_id = ?", (incident_id,)).fetchone()
+        return RemediationPlan(**json.loads(row[0])) if row else None
+
+    # --- Actions ---
+    def log_action(self, log: ActionLog):
+        self._commit([("action", log, None)])
+
+    # --- Analytics ---
+    def iter_incident_items(self) -> Iterator[Dict[str, Any]]:
+        for (item,) in self._execute("SELECT item FROM incidents ORDER BY rowid"):
+            yield json.loads(item)
+
+    def iter_action_items(self) -> Iterator[Dict[str, Any]]:
+        for (item,) in self._execute("SELECT item FROM actions ORDER BY seq"):
+            yield json.loads(item)
+
+    # --- Counters ---
+    def increment_counter(self, key: str, limit: int, window_seconds: Optional[float] = None,
+                          now: Optional[float] = None, amount: int = 1) -> bool:
+        """Same semantics as LocalStorage.increment_counter, atomic across processes."""
+        return self.increment_counters([(key, limit, window_seconds, amount)], now) is None
+
+    @profiled("storage_io")
+    def increment_counters(self, requests: List[CounterRequest], now: Optional[float] = None) -> Optional[int]:
+        """Same semantics as LocalStorage.increment_counters, in one write transaction on the counters file."""
+        now = time.time() if now is None else now
+        with self._write(self.counters_path) as conn:
+            staged: Dict[str, Any] = {}
+            for n, (key, limit, window_seconds, amount) in enumerate(requests):
+                if key in staged:
+                    current = staged[key]
+                else:
+                    row = conn.execute("SELECT value FROM counters WHERE counter_key = ?", (key,)).fetchone()
+                    current = json.loads(row[0]) if row else None
+                allowed, staged[key] = counters.try_increment(current, limit, window_seconds, now, amount)
+                if not allowed:
+                    return n  # nothing was written; the transaction commits empty
+            conn.executemany("INSERT OR REPLACE INTO counters (counter_key, value) VALUES (?, ?)",
+                             [(key, json.dumps(value)) for key, value in staged.items()])
+        return None
 
 class DynamoDBStorage:
     def __init__(self):
+        # Blobs this container already wrote/saw; skips the write on warm invocations
+        self._known_blobs = set()
+
+    # boto3 and each Table are built on first use, so a cold start only pays for what it touches
+    @cached_property
+    def ddb(self):
         import boto3
-        self.ddb = boto3.resource("dynamodb")
-        self.table_incidents = self.ddb.Table(os.environ.get("TABLE_INCIDENTS", "Incidents"))
-        self.table_plans = self.ddb.Table(os.environ.get("TABLE_PLANS", "Plans"))
-        self.table_actions = self.ddb.Table(os.environ.get("TABLE_ACTIONS", "ActionLogs"))
+        return boto3.resource("dynamodb")
+
+    @cached_property
+    def table_incidents(self):
+        return self.ddb.Table(os.environ.get("TABLE_INCIDENTS", "Incidents"))
+
+    @cached_property
+    def table_plans(self):
+        return self.ddb.Table(os.environ.get("TABLE_PLANS", "Plans"))
+
+    @cached_property
+    def table_actions(self):
+        return self.ddb.Table(os.environ.get("TABLE_ACTIONS", "ActionLogs"))
+
+    @cached_property
+    def table_events(self):
+        return self.ddb.Table(os.environ.get("TABLE_EVENTS", "EventBlobs"))
+
+    @cached_property
+    def table_counters(self):
+        return self.ddb.Table(os.environ.get("TABLE_COUNTERS", "Counters"))
+
+    def _put_blob(self, event_ref: str, blob: bytes):
+        if event_ref in self._known_blobs:
+            return
+        try:
+            self.table_events.put_item(
+                Item={"event_hash": event_ref, "payload": blob},
+                ConditionExpression="attribute_not_exists(event_hash)"
+            )
+        except self.ddb.meta.client.exceptions.ConditionalCheckFailedException:
+            pass  # Stored by an earlier incident
+        self._known_blobs.add(event_ref)
+
+    def transaction(self) -> UnitOfWork:
+        return UnitOfWork(self)
+
+    def _put_request(self, kind: str, obj: Any, expected_state: Optional[IncidentState]) -> Dict[str, Any]:
+        if kind == "plan":
+            return {"table": self.table_plans, "Item": _to_ddb(obj.model_dump())}
+        if kind == "action":
+            item = obj.model_dump()
+            item["ts_action_id"] = f"{obj.timestamp}#{obj.action_id}" # Sort key
+            return {"table": self.table_actions, "Item": _to_ddb(item)}
+
+        # Incident: optimistic lock on version, optionally on the current state
+        names = {"#v": "version"}
+        if obj.version == 0:
+            condition, values = "attribute_not_exists(#v)", {}
+        else:
+            condition, values = "#v = :v", {":v": obj.version}
+        if expected_state:
+            condition = f"({condition}) AND #s = :s"
+            names["#s"] = "state"
+            values[":s"] = expected_state.value
+        request = {
+            "table": self.table_incidents,
+            "Item": _to_ddb(_incident_item(obj, self._put_blob)),
+            "ConditionExpression": condition,
+            "ExpressionAttributeNames": names,
+        }
+        if values:
+            request["ExpressionAttributeValues"] = values
+        return request
+
+    @profiled("storage_io")
+    def _commit(self, ops):
+        """
+        One op is a plain (conditional) put_item; several go out as a single
+        TransactWriteItems call, which costs one round trip and is all-or-nothing.
+        """
+        if len(ops) > MAX_TRANSACTION_ITEMS:
+            raise ValueError(f"Transaction has {len(ops)} writes, DynamoDB allows {MAX_TRANSACTION_ITEMS}")
+        requests = [self._put_request(*op) for op in ops]
+        client = self.ddb.meta.client
 
-    def save_incident(self, incident: Incident):
-        self.table_incidents.put_item(Item=incident.model_dump())
+        if len(requests) == 1:
+            request = dict(requests[0])
+            table = request.pop("table")
+            try:
+                table.put_item(**request)
+            except client.exceptions.ConditionalCheckFailedException as e:
+                raise StateConflictError(str(e)) from e
+        else:
+            # The resource's client serializes plain Python values itself
+            items = []
+            for request in requests:
+                put = dict(request)
+                put["TableName"] = put.pop("table").name
+                items.append({"Put": put})
+            try:
+                client.transact_write_items(TransactItems=items)
+            except client.exceptions.TransactionCanceledException as e:
+                reasons = [r.get("Code") for r in e.response.get("CancellationReasons", [])]
+                raise StateConflictError(f"Transaction cancelled: {reasons}") from e
+        _committed(ops)
 
-    def get_incident(self, incident_id: str) -> Optional[Incident]:
+    def save_incident(self, incident: Incident, expected_state: Optional[IncidentState] = None):
+        self._commit([("incident", incident, expected_state)])
+
+    @profiled("storage_io")
+    def get_incident(self, incident_id: str, include_event: bool = False) -> Optional[Incident]:
         resp = self.table_incidents.get_item(Key={"incident_id": incident_id})
         if "Item" in resp:
-            return Incident(**resp["Item"])
+            incident = Incident(**resp["Item"])
+            if include_event and incident.event_ref:
+                incident.cloudwatch_event = self.get_event(incident)
+            return incident
         return None
+
+    @profiled("storage_io")
+    def get_event(self, incident: Incident) -> Dict[str, Any]:
+        """Loads the raw CloudWatch event for an incident from the blob table."""
+        if not incident.event_ref:
+            return incident.cloudwatch_event
+        resp = self.table_events.get_item(Key={"event_hash": incident.event_ref})
+        payload = resp["Item"]["payload"]
+        stable = event_blobs.decompress(getattr(payload, "value", payload))  # boto3 Binary wrapper
+        self._known_blobs.add(incident.event_ref)
+        return event_blobs.merge_event(stable, incident.event_envelope)
         
+    @profiled("storage_io")
     def list_incidents(self) -> List[Incident]:
         # Scan is expensive; used here only for demo lists
         resp = self.table_incidents.scan()
@@ -88,9 +603,9 @@ class DynamoDBStorage:
 
     def save_plan(self, plan: RemediationPlan):
          # Composite key handling simplified for demo
-        item = plan.model_dump()
-        self.table_plans.put_item(Item=item)
+        self._commit([("plan", plan, None)])
 
+    @profiled("storage_io")
     def get_plan(self, incident_id: str) -> Optional[RemediationPlan]:
         # In real app, query by partition key and sort by version desc
         resp = self.table_plans.query(
@@ -103,12 +618,130 @@ class DynamoDBStorage:
         return None
 
     def log_action(self, log: ActionLog):
-        item = log.model_dump()
-        item["ts_action_id"] = f"{log.timestamp}#{log.action_id}" # Sort key
-        self.table_actions.put_item(Item=item)
-
-# Switch backend
-if os.environ.get("AWS_LAMBDA_FUNCTION_NAME"):
-    db = DynamoDBStorage()
-else:
-    db = LocalStorage()
+        self._commit([("action", log, None)])
+
+    def _scan(self, table, fields) -> Iterator[Dict[str, Any]]:
+        # Paginated scan projecting only the given attributes (several are reserved words)
+        names = {f"#f{i}": f for i, f in enumerate(fields)}
+        kwargs = {"ProjectionExpression": ", ".join(names), "ExpressionAttributeNames": names}
+        while True:
+            resp = table.scan(**kwargs)
+            yield from resp.get("Items", [])
+            if "LastEvaluatedKey" not in resp:
+                return
+            kwargs["ExclusiveStartKey"] = resp["LastEvaluatedKey"]
+
+    def iter_incident_items(self) -> Iterator[Dict[str, Any]]:
+        """Raw incident items (no model validation), for bulk analytics."""
+        return self._scan(self.table_incidents, INCIDENT_STAT_FIELDS)
+
+    def iter_action_items(self) -> Iterator[Dict[str, Any]]:
+        return self._scan(self.table_actions, ACTION_STAT_FIELDS)
+
+    @profiled("storage_io")
+    def increment_counter(self, key: str, limit: int, window_seconds: Optional[float] = None,
+                          now: Optional[float] = None, amount: int = 1) -> bool:
+        now = time.time() if now is None else now
+        conflict = self.ddb.meta.client.exceptions.ConditionalCheckFailedException
+        if window_seconds is None:
+            # Single atomic conditional ADD
+            try:
+                self.table_counters.update_item(
+                    Key={"counter_key": key},
+                    UpdateExpression="ADD #n :amount SET expires_at = :exp",
+                    ConditionExpression="attribute_not_exists(#n) OR #n <= :max",
+                    ExpressionAttributeNames={"#n": "n"},
+                    ExpressionAttributeValues={
+                        ":amount": amount, ":max": limit - amount, ":exp": int(now + COUNTER_TTL_SECONDS)
+                    }
+                )
+                return True
+            except conflict:
+                return False
+
+        # Sliding window: the ring lives in one item, updated with an optimistic version check
+        for _ in range(COUNTER_MAX_RETRIES):
+            state, version = self._read_window(key)
+            allowed, state = counters.try_add(state, limit, window_seconds, now, amount)
+            if not allowed:
+                return False
+            try:
+                self.table_counters.put_item(
+                    Item={"counter_key": key, **state, "version": version + 1,
+                          "expires_at": int(now + window_seconds)},
+                    ConditionExpression="attribute_not_exists(counter_key) OR version = :v",
+                    ExpressionAttributeValues={":v": version}
+                )
+                return True
+            except conflict:
+                continue  # Someone else updated the window; re-read and retry
+        raise RuntimeError(f"Counter {key} still contended after {COUNTER_MAX_RETRIES} attempts")
+
+    def _read_window(self, key: str) -> Tuple[Optional[Dict[str, Any]], int]:
+        item = self.table_counters.get_item(Key={"counter_key": key}, ConsistentRead=True).get("Item")
+        if not item:
+            return None, 0
+        state = {"buckets": [int(b) for b in item["buckets"]], "head": int(item["head"]), "total": int(item["total"])}
+        return state, int(item["version"])
+
+    @profiled("storage_io")
+    def increment_counters(self, requests: List[CounterRequest], now: Optional[float] = None) -> Optional[int]:
+        """
+        Same semantics as LocalStorage.increment_counters. Several counters go out as one
+        TransactWriteItems call: plain counts as conditional ADDs, windows as puts conditioned
+        on the version they were read at (re-read and retried if another writer got there first).
+        """
+        if len(requests) == 1:
+            key, limit, window_seconds, amount = requests[0]
+            return None if self.increment_counter(key, limit, window_seconds, now, amount) else 0
+        if len(requests) > MAX_TRANSACTION_ITEMS:
+            raise ValueError(f"{len(requests)} counters in one reservation, DynamoDB allows {MAX_TRANSACTION_ITEMS}")
+        now = time.time() if now is None else now
+        client = self.ddb.meta.client
+        table = self.table_counters.name
+        for _ in range(COUNTER_MAX_RETRIES):
+            items = []
+            for n, (key, limit, window_seconds, amount) in enumerate(requests):
+                if window_seconds is None:
+                    items.append({"Update": {
+                        "TableName": table,
+                        "Key": {"counter_key": key},
+                        "UpdateExpression": "ADD #n :amount SET expires_at = :exp",
+                        "ConditionExpression": "attribute_not_exists(#n) OR #n <= :max",
+                        "ExpressionAttributeNames": {"#n": "n"},
+                        "ExpressionAttributeValues": {
+                            ":amount": amount, ":max": limit - amount, ":exp": int(now + COUNTER_TTL_SECONDS)
+                        },
+                    }})
+                    continue
+                state, version = self._read_window(key)
+                allowed, state = counters.try_add(state, limit, window_seconds, now, amount)
+                if not allowed:
+                    return n
+                items.append({"Put": {
+                    "TableName": table,
+                    "Item": {"counter_key": key, **state, "version": version + 1,
+                             "expires_at": int(now + window_seconds)},
+                    "ConditionExpression": "attribute_not_exists(counter_key) OR version = :v",
+                    "ExpressionAttributeValues": {":v": version},
+                }})
+            try:
+                client.transact_write_items(TransactItems=items)
+                return None
+            except client.exceptions.TransactionCanceledException as e:
+                reasons = [r.get("Code") for r in e.response.get("CancellationReasons", [])]
+                for n, code in enumerate(reasons):
+                    if code == "ConditionalCheckFailed" and requests[n][2] is None:
+                        return n  # A plain count is at its limit
+                # Otherwise a window changed since it was read: re-read and retry
+        raise RuntimeError(f"Counters {[r[0] for r in requests]} still contended after {COUNTER_MAX_RETRIES} attempts")
+
+def _select_backend():
+    if os.environ.get("AWS_LAMBDA_FUNCTION_NAME"):
+        return DynamoDBStorage()
+    if os.environ.get("RR_STORAGE") == "sqlite":
+        return SQLiteStorage()
+    return LocalStorage()
+
+# Backend is picked and built on first use: importing storage creates no files or clients
+db = LazyObject(_select_backend)
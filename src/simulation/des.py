@@ -0,0 +1,271 @@
+import heapq
+import itertools
+import math
+import random
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from pydantic import BaseModel, Field
+
+from src.planner.loader import find_matching_runbook
+from src.shared.models import IncidentState
+from src.shared.profiling import profiled
+
+class Dist(BaseModel):
+    """
+    Duration distribution in seconds.
+    kind: fixed (value) | uniform (low, high) | exponential (mean) | lognormal (median, sigma)
+    """
+    kind: str = "fixed"
+    value: float = 0.0
+    low: float = 0.0
+    high: float = 0.0
+    mean: float = 0.0
+    median: float = 0.0
+    sigma: float = 0.5
+
+    def sample(self, rng: random.Random) -> float:
+        if self.kind == "fixed":
+            return self.value
+        if self.kind == "uniform":
+            return rng.uniform(self.low, self.high)
+        if self.kind == "exponential":
+            return rng.expovariate(1.0 / self.mean)
+        if self.kind == "lognormal":
+            return rng.lognormvariate(math.log(self.median), self.sigma)
+        raise ValueError(f"Unknown distribution kind {self.kind}")
+
+def fixed(value: float) -> Dist:
+    return Dist(kind="fixed", value=value)
+
+def lognormal(median: float, sigma: float = 0.5) -> Dist:
+    return Dist(kind="lognormal", median=median, sigma=sigma)
+
+class AlarmSource(BaseModel):
+    alarm_name: str
+    namespace: str
+    weight: float = 1.0
+
+class SimConfig(BaseModel):
+    """All durations are in (virtual) seconds."""
+    days: float = 14
+    incidents_per_day: float = 20
+    seed: int = 42
+    alarms: List[AlarmSource] = Field(default_factory=lambda: [
+        AlarmSource(alarm_name="ec2-high-cpu-prod", namespace="AWS/EC2", weight=8),
+        AlarmSource(alarm_name="rds-high-connections", namespace="AWS/RDS", weight=2),
+    ])
+
+    # Automated pipeline
+    ingest_latency: Dist = Field(default_factory=lambda: lognormal(0.3))
+    plan_latency: Dist = Field(default_factory=lambda: lognormal(1.0))
+    action_latency: Dict[str, Dist] = Field(default_factory=lambda: {
+        "scale_asg": lognormal(5),
+        "ssm_restart_service": lognormal(45),
+        "scale_ecs_service": lognormal(20),
+        "rollback_deployment": lognormal(90),
+    })
+    default_action_latency: Dist = Field(default_factory=lambda: lognormal(30))
+    action_failure_prob: float = 0.03
+    verify_delay: Dist = Field(default_factory=lambda: fixed(180))  # alarm evaluation periods
+    verify_success_prob: float = 0.9
+    max_retries: int = 2
+    retry_backoff: Dist = Field(default_factory=lambda: fixed(60))
+
+    # Humans
+    approval_response: Dist = Field(default_factory=lambda: lognormal(8 * 60, 0.8))
+    approval_review_time: Dist = Field(default_factory=lambda: lognormal(2 * 60))
+    approval_reject_prob: float = 0.05
+    page_ack: Dist = Field(default_factory=lambda: lognormal(5 * 60, 0.7))
+    manual_fix_time: Dist = Field(default_factory=lambda: lognormal(12 * 60, 0.6))
+
+class VirtualClock:
+    """
+    Discrete-event engine: a virtual clock plus a priority queue of pending events.
+    Time jumps straight to the next event, so simulated days take milliseconds.
+    """
+    def __init__(self):
+        self.now = 0.0
+        self._queue: List[Tuple[float, int, Callable, tuple]] = []
+        self._seq = itertools.count()  # FIFO tie-break for events at the same instant
+
+    def schedule(self, delay: float, callback: Callable, *args):
+        heapq.heappush(self._queue, (self.now + max(0.0, delay), next(self._seq), callback, args))
+
+    def run(self, until: Optional[float] = None) -> int:
+        processed = 0
+        while self._queue:
+            if until is not None and self._queue[0][0] > until:
+                break
+            self.now, _, callback, args = heapq.heappop(self._queue)
+            callback(*args)
+            processed += 1
+        return processed
+
+class SimIncident(BaseModel):
+    incident_id: int
+    alarm_name: str
+    namespace: str
+    created_at: float
+    resolved_at: Optional[float] = None
+    state: IncidentState = IncidentState.OPEN
+    automated: bool = False
+    approvals: int = 0
+    retries: int = 0
+    operator_seconds: float = 0.0
+
+class MTTRSimulation:
+    """
+    Drives ingest -> plan -> approval -> execute -> verify for a stream of alarms in virtual time.
+    Runbook matching and approval policy come from the real runbooks; stage latencies,
+    failures and human response times come from SimConfig.
+    mode="manual" sends every incident down the paging path (the no-automation baseline).
+    """
+    def __init__(self, config: SimConfig, mode: str = "ranger"):
+        if mode not in ("ranger", "manual"):
+            raise ValueError(f"Unknown mode {mode}")
+        self.config = config
+        self.mode = mode
+        self.clock = VirtualClock()
+        self.rng = random.Random(config.seed)
+        self.incidents: List[SimIncident] = []
+        self._runbooks: Dict[Tuple[str, str], Any] = {}
+
+    def _runbook(self, inc: SimIncident):
+        key = (inc.alarm_name, inc.namespace)
+        if key not in self._runbooks:
+            self._runbooks[key] = find_matching_runbook(inc.alarm_name, inc.namespace)
+        return self._runbooks[key]
+
+    # --- Arrivals ---
+    def _schedule_arrivals(self):
+        horizon = self.config.days * 86400
+        mean_gap = 86400 / self.config.incidents_per_day
+        weights = [a.weight for a in self.config.alarms]
+        t = 0.0
+        while True:
+            t += self.rng.expovariate(1.0 / mean_gap)
+            if t > horizon:
+                return
+            alarm = self.rng.choices(self.config.alarms, weights=weights)[0]
+            self.clock.schedule(t, self._on_alarm, alarm)
+
+    def _on_alarm(self, alarm: AlarmSource):
+        inc = SimIncident(
+            incident_id=len(self.incidents),
+            alarm_name=alarm.alarm_name,
+            namespace=alarm.namespace,
+            created_at=self.clock.now
+        )
+        self.incidents.append(inc)
+        if self.mode == "manual":
+            self._escalate(inc)
+        else:
+            self.clock.schedule(self.config.ingest_latency.sample(self.rng), self._on_ingested, inc)
+
+    # --- Automated pipeline ---
+    def _on_ingested(self, inc: SimIncident):
+        self.clock.schedule(self.config.plan_latency.sample(self.rng), self._on_planned, inc)
+
+    def _on_planned(self, inc: SimIncident):
+        runbook = self._runbook(inc)
+        if not runbook:
+            self._escalate(inc)
+            return
+        inc.state = IncidentState.MITIGATING
+        if any(a.safety.get("approval_required", False) for a in runbook.actions):
+            inc.approvals += 1
+            self.clock.schedule(self.config.approval_response.sample(self.rng), self._on_approval, inc)
+        else:
+            self._execute(inc)
+
+    def _on_approval(self, inc: SimIncident):
+        inc.operator_seconds += self.config.approval_review_time.sample(self.rng)
+        if self.rng.random() < self.config.approval_reject_prob:
+            self._escalate(inc)
+        else:
+            self._execute(inc)
+
+    def _execute(self, inc: SimIncident):
+        duration = 0.0
+        failed = False
+        for action in self._runbook(inc).actions:
+            dist = self.config.action_latency.get(action.type, self.config.default_action_latency)
+            duration += dist.sample(self.rng)
+            if self.rng.random() < self.config.action_failure_prob:
+                failed = True
+                break  # Executor stops on first error
+        self.clock.schedule(duration, self._on_executed, inc, failed)
+
+    def _on_executed(self, inc: SimIncident, failed: bool):
+        if failed:
+            self._retry_or_escalate(inc)
+        else:
+            self.clock.schedule(self.config.verify_delay.sample(self.rng), self._on_verify, inc)
+
+    def _on_verify(self, inc: SimIncident):
+        if self.rng.random() < self.config.verify_success_prob:
+            inc.automated = True
+            self._resolve(inc)
+        else:
+            self._retry_or_escalate(inc)
+
+    def _retry_or_escalate(self, inc: SimIncident):
+        if inc.retries < self.config.max_retries:
+            inc.retries += 1
+            self.clock.schedule(self.config.retry_backoff.sample(self.rng), self._execute, inc)
+        else:
+            self._escalate(inc)
+
+    # --- Humans ---
+    def _escalate(self, inc: SimIncident):
+        # Page on-call; they acknowledge and then fix by hand
+        self.clock.schedule(self.config.page_ack.sample(self.rng), self._on_ack, inc)
+
+    def _on_ack(self, inc: SimIncident):
+        fix_time = self.config.manual_fix_time.sample(self.rng)
+        inc.operator_seconds += fix_time
+        self.clock.schedule(fix_time, self._resolve, inc)
+
+    def _resolve(self, inc: SimIncident):
+        inc.state = IncidentState.RESOLVED
+        inc.resolved_at = self.clock.now
+
+    @profiled("simulation")
+    def run(self) -> Dict[str, Any]:
+        started = time.perf_counter()
+        self._schedule_arrivals()
+        events = self.clock.run()
+        return summarize(self.incidents, events=events, wall_seconds=time.perf_counter() - started,
+                         mode=self.mode)
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, max(0, math.ceil(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[idx]
+
+def summarize(incidents: List[SimIncident], events: int, wall_seconds: float, mode: str) -> Dict[str, Any]:
+    ttr = sorted((i.resolved_at - i.created_at) / 60 for i in incidents if i.resolved_at is not None)
+    n = len(incidents) or 1
+    return {
+        "mode": mode,
+        "incidents": len(incidents),
+        "resolved": len(ttr),
+        "automated_pct": round(100 * sum(i.automated for i in incidents) / n, 1),
+        "approvals": sum(i.approvals for i in incidents),
+        "retries": sum(i.retries for i in incidents),
+        "mttr_min": round(sum(ttr) / len(ttr), 2) if ttr else 0.0,
+        "ttr_p50_min": round(_percentile(ttr, 50), 2),
+        "ttr_p90_min": round(_percentile(ttr, 90), 2),
+        "ttr_p99_min": round(_percentile(ttr, 99), 2),
+        "operator_min_per_incident": round(sum(i.operator_seconds for i in incidents) / 60 / n, 2),
+        "events": events,
+        "wall_seconds": round(wall_seconds, 3),
+    }
+
+def run_benchmark(config: SimConfig) -> Dict[str, Dict[str, Any]]:
+    """Runs the same alarm stream through the manual baseline and Runbook Ranger."""
+    return {
+        "manual": MTTRSimulation(config, mode="manual").run(),
+        "ranger": MTTRSimulation(config, mode="ranger").run(),
+    }
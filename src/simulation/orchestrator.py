@@ -1,9 +1,8 @@
+import json
 import time
 from rich.console import Console
 from src.ingest.handler import handler as ingest_handler
 from src.planner.handler import handler_manual_trigger as planner_handler
-from src.shared.storage import db
-from src.shared.models import IncidentState
 
 console = Console()
 
@@ -21,8 +20,11 @@ class Orchestrator:
         if ingest_res["statusCode"] != 200:
             console.print(f"[red]Ingestion failed:[/red] {ingest_res}")
             return
+        if ingest_res["body"] == "Ignored":
+            console.print("Not an ALARM transition. Nothing to do.")
+            return
             
-        res_body = eval(ingest_res["body"]) # safely parse json in real app
+        res_body = json.loads(ingest_res["body"])
         incident_id = res_body["incident_id"]
         console.print(f"Incident Created: {incident_id}")
 
@@ -37,10 +39,7 @@ class Orchestrator:
         if plan.requires_approval:
             console.print("[bold cyan]Plan requires approval. Pausing execution.[/bold cyan]")
             console.print(f"Run [bold]rr approve {incident_id}[/bold] to continue.")
-            # Update state to MITIGATING (waiting)
-            incident = db.get_incident(incident_id)
-            incident.state = IncidentState.MITIGATING
-            db.save_incident(incident)
+            # Planner already moved the incident to MITIGATING (waiting)
             return
         
         # 4. Execute (Auto-Approve)
@@ -48,11 +47,11 @@ class Orchestrator:
         from src.executor.handler import execute_plan
         execute_plan(incident_id)
 
-    def resume_approval(self, incident_id):
+    def resume_approval(self, incident_id, force=False):
         console.print(f"[bold yellow]Resuming Incident {incident_id}[/bold yellow]")
         # 4. Execute (after approval)
         from src.executor.handler import execute_plan
-        execute_plan(incident_id)
+        execute_plan(incident_id, force=force)
 
 # Global
 orchestrator = Orchestrator()
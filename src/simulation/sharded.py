@@ -0,0 +1,220 @@
+import contextlib
+import json
+import multiprocessing
+import os
+import queue
+import tempfile
+import time
+import zlib
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from src.simulation.des import _percentile
+
+# Dimensions that identify the resource an alarm is about, in priority order.
+# Events for the same resource always go to the same shard, so they stay in order.
+RESOURCE_DIMENSIONS = ("AutoScalingGroupName", "InstanceId")
+
+# Events per queue message, and messages buffered per shard before the dispatcher blocks
+BATCH_SIZE = 50
+QUEUE_DEPTH = 64
+
+# How often the dispatcher checks that workers are alive while it waits on a queue
+LIVENESS_POLL_SECONDS = 1.0
+
+STAGES = ("ingest", "plan", "execute", "total")
+
+def resource_key(event: Dict[str, Any]) -> str:
+    detail = event.get("detail", {})
+    for metric in detail.get("configuration", {}).get("metrics", []):
+        dimensions = metric.get("metricStat", {}).get("metric", {}).get("dimensions", {})
+        for name in RESOURCE_DIMENSIONS:
+            if dimensions.get(name):
+                return f"{name}={dimensions[name]}"
+    # No known resource: alarms of the same name share a shard
+    return f"alarm={detail.get('alarmName')}"
+
+def shard_for(key: str, shards: int) -> int:
+    # crc32, not hash(): stable across processes and runs
+    return zlib.crc32(key.encode()) % shards
+
+def _process(event: Dict[str, Any], handlers, auto_approve: bool, latencies: Dict[str, List[float]]) -> str:
+    """Runs one event through ingest -> plan -> execute, like the Orchestrator. Returns its outcome."""
+    ingest, plan_incident, execute = handlers
+    start = time.perf_counter()
+    res = ingest(event)
+    ingested = time.perf_counter()
+    latencies["ingest"].append((ingested - start) * 1000)
+    if res["statusCode"] != 200 or "incident_id" not in res["body"]:
+        return "ignored" if res["statusCode"] == 200 else "invalid"
+
+    incident_id = json.loads(res["body"])["incident_id"]
+    plan = plan_incident(incident_id)
+    planned = time.perf_counter()
+    latencies["plan"].append((planned - ingested) * 1000)
+    if not plan:
+        outcome = "no_runbook"
+    elif plan.requires_approval and not auto_approve:
+        outcome = "awaiting_approval"
+    else:
+        incident = execute(incident_id)
+        latencies["execute"].append((time.perf_counter() - planned) * 1000)
+        outcome = incident.state.value if incident else "not_executed"
+    latencies["total"].append((time.perf_counter() - start) * 1000)
+    return outcome
+
+def _worker(shard: int, inbox, outbox, env: Dict[str, str], auto_approve: bool, quiet: bool):
+    # Storage and runbook bundle are picked from env on first use, inside this process
+    os.environ.update(env)
+    with open(os.devnull, "w") as devnull, \
+            (contextlib.redirect_stdout(devnull) if quiet else contextlib.nullcontext()):
+        try:
+            from src.ingest.handler import handler as ingest_handler
+            from src.planner.handler import handler_manual_trigger
+            from src.executor.handler import execute_plan
+            from src.shared.storage import db
+            db.transaction  # open the backend before the clock starts
+        except Exception as e:
+            outbox.put(("error", f"shard {shard} failed to start: {type(e).__name__}: {e}"))
+            return
+        handlers = (ingest_handler, handler_manual_trigger, execute_plan)
+        outbox.put(("ready", shard))
+
+        latencies: Dict[str, List[float]] = {stage: [] for stage in STAGES}
+        outcomes: Counter[str] = Counter()
+        busy = 0.0
+        while True:
+            batch = inbox.get()
+            if batch is None:
+                break
+            started = time.perf_counter()
+            for line in batch:
+                try:
+                    outcomes[_process(json.loads(line), handlers, auto_approve, latencies)] += 1
+                except Exception as e:
+                    outcomes["error"] += 1
+                    if not quiet:
+                        print(f"[shard {shard}] {type(e).__name__}: {e}")
+            busy += time.perf_counter() - started
+    outbox.put(("done", {"shard": shard, "outcomes": dict(outcomes), "latencies": latencies, "busy_seconds": busy}))
+
+def _dead(workers) -> List[str]:
+    return [f"shard {n} exited with code {w.exitcode}" for n, w in enumerate(workers)
+            if w.exitcode is not None and w.exitcode != 0]
+
+def _receive(outbox, workers) -> Tuple[str, Any]:
+    """Next worker message. Raises instead of waiting forever if a worker died."""
+    while True:
+        try:
+            return outbox.get(timeout=LIVENESS_POLL_SECONDS)
+        except queue.Empty:
+            dead = _dead(workers)
+            if dead:
+                raise RuntimeError(f"Worker died without reporting: {', '.join(dead)}")
+
+def _send(inbox, batch: Optional[List[str]], shard: int, worker):
+    """Queues a batch for a worker. Raises instead of blocking forever if the worker died."""
+    while True:
+        try:
+            inbox.put(batch, timeout=LIVENESS_POLL_SECONDS)
+            return
+        except queue.Full:
+            if not worker.is_alive():
+                raise RuntimeError(f"Worker died: shard {shard} exited with code {worker.exitcode}")
+
+def _distribution(values: List[float]) -> Dict[str, float]:
+    values = sorted(values)
+    return {
+        "count": len(values),
+        "p50": round(_percentile(values, 50), 3),
+        "p90": round(_percentile(values, 90), 3),
+        "p99": round(_percentile(values, 99), 3),
+        "max": round(values[-1], 3) if values else 0.0,
+    }
+
+def run_sharded(lines: Iterable[str], shards: int, db_path: str, runbooks_dir: Optional[str] = None,
+                auto_approve: bool = False, quiet: bool = True) -> Dict[str, Any]:
+    """
+    Replays alarm events (JSONL lines) through `shards` worker processes that share
+    one SQLite store, and returns a combined throughput/latency report. The runbooks
+    are compiled into a bundle once, so workers do not re-read YAML for every plan.
+    """
+    from src.planner.bundle import build_bundle, write_bundle
+
+    ctx = multiprocessing.get_context("spawn")  # clean interpreters: no inherited storage or locks
+    with tempfile.TemporaryDirectory() as tmp:
+        bundle, _ = build_bundle(runbooks_dir)
+        bundle_path = os.path.join(tmp, "runbooks.bundle.json")
+        write_bundle(bundle, bundle_path)
+        env = {"RR_STORAGE": "sqlite", "RR_DB_PATH": os.path.abspath(db_path), "RUNBOOK_BUNDLE": bundle_path}
+
+        # Create the schema once, before workers race for it
+        from src.shared.storage import SQLiteStorage
+        SQLiteStorage(env["RR_DB_PATH"])
+
+        outbox = ctx.Queue()
+        inboxes = [ctx.Queue(QUEUE_DEPTH) for _ in range(shards)]
+        workers = [ctx.Process(target=_worker, args=(n, inboxes[n], outbox, env, auto_approve, quiet))
+                   for n in range(shards)]
+        for w in workers:
+            w.start()
+        try:
+            for _ in workers:
+                kind, info = _receive(outbox, workers)
+                if kind == "error":
+                    raise RuntimeError(info)
+
+            started = time.perf_counter()
+            pending: List[List[str]] = [[] for _ in range(shards)]
+            dispatched: Counter[int] = Counter()
+            invalid = 0
+            for line in lines:
+                if not line.strip():
+                    continue
+                try:
+                    shard = shard_for(resource_key(json.loads(line)), shards)
+                except (ValueError, AttributeError):
+                    invalid += 1
+                    continue
+                pending[shard].append(line)
+                dispatched[shard] += 1
+                if len(pending[shard]) >= BATCH_SIZE:
+                    _send(inboxes[shard], pending[shard], shard, workers[shard])
+                    pending[shard] = []
+            for shard, batch in enumerate(pending):
+                if batch:
+                    _send(inboxes[shard], batch, shard, workers[shard])
+                _send(inboxes[shard], None, shard, workers[shard])
+
+            results = [_receive(outbox, workers)[1] for _ in workers]
+            wall = time.perf_counter() - started
+        except BaseException:
+            for w in workers:
+                w.terminate()
+            raise
+        for w in workers:
+            w.join()
+
+    results.sort(key=lambda r: r["shard"])
+    outcomes: Counter[str] = Counter()
+    if invalid:
+        outcomes["invalid"] += invalid
+    latencies: Dict[str, List[float]] = {stage: [] for stage in STAGES}
+    for r in results:
+        outcomes.update(r["outcomes"])
+        for stage in STAGES:
+            latencies[stage].extend(r["latencies"][stage])
+    events = sum(dispatched.values())
+    return {
+        "shards": shards,
+        "events": events,
+        "wall_seconds": round(wall, 3),
+        "throughput_eps": round(events / wall, 1) if wall else 0.0,
+        "outcomes": dict(outcomes),
+        "latency_ms": {stage: _distribution(latencies[stage]) for stage in STAGES},
+        "per_shard": [
+            {"shard": r["shard"], "events": dispatched[r["shard"]], "busy_seconds": round(r["busy_seconds"], 3),
+             "throughput_eps": round(dispatched[r["shard"]] / r["busy_seconds"], 1) if r["busy_seconds"] else 0.0}
+            for r in results
+        ],
+        "storage": env["RR_DB_PATH"],
+    }
@@ -0,0 +1,33 @@
+import copy
+import json
+import os
+from typing import Any, Dict, Optional
+
+# Shared test fixtures, resolved from this file so tests run from any directory
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+RUNBOOKS_DIR = os.path.join(REPO_ROOT, "runbooks")
+SAMPLE_EVENT_FILE = os.path.join(RUNBOOKS_DIR, "samples", "high_cpu.json")
+
+with open(SAMPLE_EVENT_FILE) as f:
+    SAMPLE_EVENT = json.load(f)
+
+def alarm_event(alarm_name: Optional[str] = None, namespace: Optional[str] = None,
+                dimensions: Optional[Dict[str, str]] = None, state: Optional[str] = None,
+                event_id: Optional[str] = None, reason: Optional[str] = None) -> Dict[str, Any]:
+    """A fresh copy of the sample high-CPU alarm event with the given fields replaced."""
+    event = copy.deepcopy(SAMPLE_EVENT)
+    detail = event["detail"]
+    metric = detail["configuration"]["metrics"][0]["metricStat"]["metric"]
+    if event_id is not None:
+        event["id"] = event_id
+    if alarm_name is not None:
+        detail["alarmName"] = alarm_name
+    if state is not None:
+        detail["state"]["value"] = state
+    if reason is not None:
+        detail["state"]["reason"] = reason
+    if namespace is not None:
+        metric["namespace"] = namespace
+    if dimensions is not None:
+        metric["dimensions"] = dimensions
+    return event
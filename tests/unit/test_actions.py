@@ -0,0 +1,111 @@
+import threading
+import time
+import unittest
+from unittest import mock
+from src.actions import ecs, ssm
+from src.actions.common import concurrency_limit
+from src.actions.registry import registry
+from src.shared.aws_mock import MockECS, MockSSM
+
+class TestSSMFanOut(unittest.TestCase):
+    def test_single_instance(self):
+        res = registry.execute("ssm_restart_service", {"instance_id": "i-1", "service_name": "nginx"})
+        self.assertEqual(res["targets"], 1)
+        self.assertEqual(len(res["command_ids"]), 1)
+        self.assertEqual(res["chunks"][0]["status_counts"], {"Success": 1})
+
+    def test_chunks_to_api_limit(self):
+        ids = [f"i-{n}" for n in range(120)]
+        res = registry.execute("ssm_restart_service", {"instance_ids": ids, "service_name": "nginx"})
+        self.assertEqual(res["targets"], 120)
+        self.assertEqual([c["targets"] for c in res["chunks"]], [50, 50, 20])
+        self.assertEqual(res["failed"], 0)
+
+    def test_tag_selector(self):
+        res = registry.execute("ssm_restart_service", {"targets": {"Role": "web"}, "service_name": "nginx"})
+        self.assertEqual(res["targets"], 120)
+        self.assertEqual(len(res["chunks"]), 3)
+
+    def test_concurrency_cap_holds(self):
+        in_flight, peak = [0], [0]
+        lock = threading.Lock()
+        send, wait = MockSSM.send_command, ssm._wait_for_invocations
+
+        def tracking_send(self, InstanceIds, **kwargs):
+            with lock:
+                in_flight[0] += len(InstanceIds)
+                peak[0] = max(peak[0], in_flight[0])
+            res = send(self, InstanceIds, **kwargs)
+            return res
+
+        def tracking_wait(client, command_id, expected, deadline):
+            statuses = wait(client, command_id, expected, deadline)
+            with lock:
+                in_flight[0] -= expected
+            return statuses
+
+        ids = [f"i-{n}" for n in range(100)]
+        with mock.patch.object(MockSSM, "send_command", tracking_send), \
+                mock.patch.object(ssm, "_wait_for_invocations", tracking_wait):
+            res = registry.execute("ssm_restart_service",
+                {"instance_ids": ids, "service_name": "nginx", "max_concurrency": "25%"})
+        self.assertEqual(len(res["chunks"]), 4)
+        self.assertLessEqual(peak[0], 25)
+
+    def test_wait_stops_at_action_budget(self):
+        def pending(self, CommandId, **kwargs):
+            return {"CommandInvocations": [{"InstanceId": "i-1", "Status": "InProgress"}]}
+
+        with mock.patch.object(MockSSM, "list_command_invocations", pending), \
+                mock.patch.object(ssm, "SSM_COMMAND_TIMEOUT_SECONDS", 0.2), \
+                mock.patch.object(ssm, "SSM_POLL_INTERVAL_SECONDS", 0.05):
+            start = time.monotonic()
+            with self.assertRaises(TimeoutError):
+                registry.execute("ssm_restart_service", {"instance_id": "i-1", "service_name": "nginx"})
+        self.assertLess(time.monotonic() - start, 1)
+
+    def test_concurrency_limit(self):
+        self.assertEqual(concurrency_limit(None, 300), 300)
+        self.assertEqual(concurrency_limit("10", 300), 10)
+        self.assertEqual(concurrency_limit("10%", 300), 30)
+        self.assertEqual(concurrency_limit("1%", 10), 1)
+
+class TestECSFanOut(unittest.TestCase):
+    def test_scale_services(self):
+        res = registry.execute("scale_ecs_service",
+            {"cluster": "my-cluster", "services": ["my-service"], "adjustment": 1})
+        svc = res["services"][0]
+        self.assertEqual(svc["new"], svc["old"] + 1)
+
+    def test_tag_selector(self):
+        res = registry.execute("scale_ecs_service",
+            {"cluster": "my-cluster", "targets": {"Role": "web"}, "adjustment": 0})
+        self.assertEqual([s["service"] for s in res["services"]], ["my-service"])
+
+    def test_tag_selector_arn_formats(self):
+        arns = [
+            "arn:aws:ecs:us-east-1:123456789012:service/my-cluster/my-service",
+            "arn:aws:ecs:us-east-1:123456789012:service/my-service",  # old format: no cluster segment
+            "arn:aws:ecs:us-east-1:123456789012:service/other-cluster/my-service",
+            "arn:aws:ecs:us-east-1:123456789012:service/gone",
+            "not-an-arn",
+        ]
+        params = {"cluster": "my-cluster", "targets": {"Role": "web"}, "adjustment": 0}
+        with mock.patch.object(ecs, "resolve_tag_selector", return_value=arns):
+            res = registry.execute("scale_ecs_service", {**params, "max_errors": 2})
+            self.assertEqual([(s["service"], s["status"]) for s in res["services"]],
+                             [("my-service", "SUCCESS"), ("not-an-arn", "FAILED"), ("gone", "FAILED")])
+            self.assertEqual(res["failed"], 2)
+
+            # Over max_errors the action fails, after every service was attempted
+            with mock.patch.object(MockECS, "update_service", side_effect=AssertionError("unexpected")) as update:
+                with self.assertRaisesRegex(RuntimeError, r"3/3 services failed.*my-service"):
+                    registry.execute("scale_ecs_service", params)
+            update.assert_called_once()
+
+    def test_missing_service(self):
+        with self.assertRaisesRegex(RuntimeError, r"1/1 services failed.*nope"):
+            registry.execute("scale_ecs_service", {"cluster": "my-cluster", "service": "nope"})
+
+if __name__ == '__main__':
+    unittest.main()
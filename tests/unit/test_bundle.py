@@ -0,0 +1,94 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from src.planner.bundle import build_bundle, write_bundle, load_bundle, RunbookBundle, BUNDLE_FORMAT
+from src.planner.loader import load_all_runbooks, match_runbook, find_matching_runbook
+from src.planner.render import event_context, render_actions
+from alarm_events import alarm_event
+
+RUNBOOK = """runbook_id: {id}
+match:
+  alarm_name_prefix: "{prefix}"
+{namespace}actions:
+  - id: scale
+    type: scale_asg
+    params:
+      asg_name: "asg-${{dimensions.AutoScalingGroupName}}-${{dimensions.Missing}}"
+      adjustment: 1
+"""
+
+class TestRunbookBundle(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.dir = os.path.join(self.tmp, "runbooks")
+        os.makedirs(self.dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def _write(self, name, rb_id, prefix, namespace=None):
+        ns = f'  namespace: "{namespace}"\n' if namespace else ""
+        with open(os.path.join(self.dir, name), "w") as f:
+            f.write(RUNBOOK.format(id=rb_id, prefix=prefix, namespace=ns))
+
+    def _bundle(self):
+        data, warnings = build_bundle(self.dir)
+        path = os.path.join(self.tmp, "bundle.json")
+        write_bundle(data, path)
+        with open(path) as f:
+            return RunbookBundle(json.load(f)), warnings
+
+    def test_matches_like_yaml_loader(self):
+        self._write("a.yaml", "a", "ec2-high", "AWS/EC2")
+        self._write("b.yaml", "b", "ec2-high-cpu")   # any namespace, later in file order
+        self._write("c.yaml", "c", "")               # catch-all
+        bundle, warnings = self._bundle()
+        self.assertEqual(warnings, [])
+        runbooks = load_all_runbooks(self.dir)
+        for alarm, ns in [("ec2-high-cpu-prod", "AWS/EC2"), ("ec2-high-cpu-prod", "AWS/RDS"),
+                          ("rds-conn", "AWS/RDS"), ("", "Unknown")]:
+            self.assertEqual(bundle.match(alarm, ns).runbook_id,
+                             match_runbook(runbooks, alarm, ns).runbook_id, (alarm, ns))
+
+    def test_renders_like_yaml_loader(self):
+        self._write("a.yaml", "a", "ec2")
+        bundle, _ = self._bundle()
+        _, context = event_context(alarm_event())
+        compiled, _ = render_actions(bundle.match("ec2-x", "AWS/EC2"), context)
+        plain, _ = render_actions(load_all_runbooks(self.dir)[0], context)
+        self.assertEqual(compiled, plain)
+        self.assertEqual(compiled[0]["params"]["asg_name"], "asg-app-prod-asg-${dimensions.Missing}")
+
+    def test_shadowed_runbook_warns(self):
+        self._write("a.yaml", "a", "ec2")
+        self._write("b.yaml", "b", "ec2")
+        bundle, warnings = self._bundle()
+        self.assertEqual(len(warnings), 1)
+        self.assertEqual(bundle.match("ec2-x", "AWS/EC2").runbook_id, "a")
+
+    def test_invalid_runbook_fails_build(self):
+        self._write("a.yaml", "a", "ec2")
+        with open(os.path.join(self.dir, "bad.yaml"), "w") as f:
+            f.write("runbook_id: bad\nmatch: {}\nactions:\n  - {id: x, type: no_such_action, params: {}}\n")
+        with self.assertRaises(ValueError) as ctx:
+            build_bundle(self.dir)
+        self.assertIn("bad.yaml", str(ctx.exception))
+
+    def test_rejects_other_format(self):
+        with self.assertRaises(ValueError):
+            RunbookBundle({"format": BUNDLE_FORMAT + 1})
+
+    def test_planner_uses_bundle_when_configured(self):
+        self._write("a.yaml", "from_bundle", "ec2")
+        data, _ = build_bundle(self.dir)
+        path = os.path.join(self.tmp, "bundle.json")
+        write_bundle(data, path)
+        with mock.patch.dict(os.environ, {"RUNBOOK_BUNDLE": path}):
+            self.assertEqual(find_matching_runbook("ec2-high-cpu-prod", "AWS/EC2").runbook_id, "from_bundle")
+        load_bundle.cache_clear()
+
+if __name__ == '__main__':
+    unittest.main()
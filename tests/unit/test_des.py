@@ -0,0 +1,69 @@
+import unittest
+from unittest import mock
+from src.simulation.des import VirtualClock, SimConfig, MTTRSimulation, AlarmSource, fixed, run_benchmark
+from alarm_events import RUNBOOKS_DIR
+
+class TestVirtualClock(unittest.TestCase):
+    def test_events_run_in_time_order(self):
+        clock = VirtualClock()
+        seen = []
+        clock.schedule(10, lambda: seen.append(("b", clock.now)))
+        clock.schedule(5, lambda: seen.append(("a", clock.now)))
+        clock.schedule(10, lambda: seen.append(("c", clock.now)))
+        self.assertEqual(clock.run(), 3)
+        self.assertEqual(seen, [("a", 5), ("b", 10), ("c", 10)])
+
+    def test_run_until(self):
+        clock = VirtualClock()
+        clock.schedule(5, lambda: None)
+        clock.schedule(50, lambda: None)
+        self.assertEqual(clock.run(until=10), 1)
+        self.assertEqual(clock.now, 5)
+
+class TestMTTRSimulation(unittest.TestCase):
+    def setUp(self):
+        # Match against the repo's runbooks wherever the tests are run from
+        patch = mock.patch("src.planner.loader.RUNBOOKS_DIR", RUNBOOKS_DIR)
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def _deterministic_config(self, **overrides):
+        data = dict(
+            days=1, incidents_per_day=10, seed=1,
+            alarms=[AlarmSource(alarm_name="ec2-high-cpu-prod", namespace="AWS/EC2")],
+            ingest_latency=fixed(1), plan_latency=fixed(1),
+            action_latency={}, default_action_latency=fixed(10),
+            action_failure_prob=0.0, verify_delay=fixed(60), verify_success_prob=1.0,
+            approval_response=fixed(300), approval_review_time=fixed(120), approval_reject_prob=0.0,
+        )
+        data.update(overrides)
+        return SimConfig(**data)
+
+    def test_approval_path_timing(self):
+        # ingest 1 + plan 1 + approval 300 + two actions 20 + verify 60
+        res = MTTRSimulation(self._deterministic_config()).run()
+        self.assertGreater(res["incidents"], 0)
+        self.assertEqual(res["resolved"], res["incidents"])
+        self.assertEqual(res["automated_pct"], 100.0)
+        self.assertAlmostEqual(res["mttr_min"], 382 / 60, places=2)
+        self.assertAlmostEqual(res["operator_min_per_incident"], 2.0, places=2)
+
+    def test_unmatched_alarm_escalates(self):
+        config = self._deterministic_config(
+            alarms=[AlarmSource(alarm_name="random-alarm", namespace="AWS/RDS")],
+            page_ack=fixed(60), manual_fix_time=fixed(600))
+        res = MTTRSimulation(config).run()
+        self.assertEqual(res["automated_pct"], 0.0)
+        self.assertAlmostEqual(res["mttr_min"], (1 + 1 + 60 + 600) / 60, places=2)
+
+    def test_same_stream_and_deterministic(self):
+        config = SimConfig(days=3, seed=7)
+        first, second = run_benchmark(config), run_benchmark(config)
+        self.assertEqual(first["manual"]["incidents"], first["ranger"]["incidents"])
+        for mode in ("manual", "ranger"):
+            first[mode].pop("wall_seconds")
+            second[mode].pop("wall_seconds")
+        self.assertEqual(first, second)
+
+if __name__ == '__main__':
+    unittest.main()
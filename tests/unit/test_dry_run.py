@@ -0,0 +1,75 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from src.planner.dry_run import dry_run
+from src.planner.render import unresolved_vars
+from alarm_events import RUNBOOKS_DIR, alarm_event as _event
+
+class TestDryRun(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.corpus = os.path.join(self.tmp, "corpus.jsonl")
+        events = [
+            _event("ec2-high-cpu-prod"),
+            _event("ec2-high-cpu-prod", dimensions={"InstanceId": "i-1"}),
+            _event("rds-high-connections", namespace="AWS/RDS"),
+            _event("ec2-high-cpu-prod", state="OK"),
+        ]
+        with open(self.corpus, "w") as f:
+            for e in events:
+                f.write(json.dumps(e) + "\n")
+            f.write("not json\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_coverage_report(self):
+        report = dry_run(self.corpus, runbooks_dir=RUNBOOKS_DIR, workers=1)
+        self.assertEqual(report["events"], 5)
+        self.assertEqual((report["alarms"], report["ignored"], report["invalid"]), (3, 1, 1))
+        self.assertEqual(report["matched"], 2)
+        self.assertEqual(report["top_unmatched"], {"rds-high-connections": 1})
+        self.assertEqual(report["by_runbook"], {"high_cpu_ec2_mitigate": 2})
+        self.assertEqual(list(report["unresolved"].values()), [1])
+        self.assertNotIn("diff", report)
+
+    def test_diff_against_other_runbooks(self):
+        baseline = os.path.join(self.tmp, "baseline")
+        shutil.copytree(RUNBOOKS_DIR, baseline)
+        path = os.path.join(baseline, "high_cpu_ec2.yaml")
+        with open(path) as f:
+            text = f.read()
+        with open(path, "w") as f:
+            f.write(text.replace("adjustment: +1", "adjustment: +2"))
+
+        report = dry_run(self.corpus, runbooks_dir=RUNBOOKS_DIR, compare_dir=baseline,
+                         workers=2, chunksize=1)
+        self.assertEqual(report["diff"]["by_kind"], {"plan_changed": 2})
+        sample = report["diff"]["samples"][0]
+        self.assertEqual(sample["before"]["actions"][0]["params"]["adjustment"], 2)
+        self.assertEqual(sample["after"]["actions"][0]["params"]["adjustment"], 1)
+
+    def test_wrong_shape_lines_count_as_invalid(self):
+        bad = [{"detail": {"state": "ALARM"}}, {"detail": "oops"}, [1, 2], "text", None,
+               {"detail": {"alarmName": ["x"], "state": {"value": "ALARM"}}},
+               {"detail": {"alarmName": "ec2-high-cpu-prod", "state": {"value": "ALARM"}, "configuration": "x"}},
+               {"detail": {"alarmName": "ec2-high-cpu-prod", "state": {"value": "ALARM"},
+                           "configuration": {"metrics": ["x"]}}}]
+        with open(self.corpus, "a") as f:
+            for line in bad:
+                f.write(json.dumps(line) + "\n")
+
+        # Through the pool too: one bad line must not abort pool.imap
+        for workers in (1, 2):
+            report = dry_run(self.corpus, runbooks_dir=RUNBOOKS_DIR, workers=workers, chunksize=1)
+            self.assertEqual(report["events"], 5 + len(bad))
+            self.assertEqual(report["invalid"], 1 + len(bad))
+            self.assertEqual(report["matched"], 2)
+
+    def test_unresolved_vars(self):
+        self.assertEqual(unresolved_vars({"a": ["${x.y}", "ok"], "b": 1}), ["x.y"])
+
+if __name__ == '__main__':
+    unittest.main()
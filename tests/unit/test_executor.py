@@ -0,0 +1,136 @@
+import time
+import tempfile
+import unittest
+from unittest import mock
+from src.actions.registry import registry
+from src.executor import handler as executor
+from src.shared.limits import BlastRadiusGuard
+from src.shared.models import Incident, IncidentState, RemediationPlan
+from src.shared.storage import LocalStorage
+
+class Crash(BaseException):
+    """Stands in for the executor dying mid-plan (Lambda timeout, OOM): nothing is committed."""
+
+class TestExecutorClaim(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = LocalStorage(self.tmp.name)
+        for patch in (mock.patch.object(executor, "db", self.db),
+                      mock.patch.object(executor, "blast_radius", BlastRadiusGuard(self.db))):
+            patch.start()
+            self.addCleanup(patch.stop)
+
+        incident = Incident(alarm_name="ec2-high-cpu-prod", summary="x", state=IncidentState.MITIGATING)
+        self.db.save_incident(incident)
+        self.incident_id = incident.incident_id
+        self.db.save_plan(RemediationPlan(incident_id=self.incident_id, actions=[
+            {"id": "scale", "type": "scale_asg", "params": {"asg_name": "app-prod-asg"}, "sanity_checks": {}},
+            {"id": "restart", "type": "ssm_restart_service", "params": {"instance_id": "i-1"}, "sanity_checks": {}},
+        ]))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _logs(self):
+        return self.db._read_json(self.db.actions_file).get(self.incident_id, [])
+
+    def test_second_executor_does_not_run_actions(self):
+        runs, second = [], []
+
+        def run(action_type, params):
+            runs.append(action_type)
+            if not second:
+                # Executor B starts while A is mid-plan
+                second.append(executor.execute_plan(self.incident_id))
+            return {"ok": True}
+
+        with mock.patch.object(registry, "execute", side_effect=run):
+            result = executor.execute_plan(self.incident_id)
+
+        self.assertEqual(second, [None])
+        self.assertEqual(runs, ["scale_asg", "ssm_restart_service"])
+        self.assertEqual(result.state, IncidentState.RESOLVED)
+        self.assertEqual(self.db.get_incident(self.incident_id).state, IncidentState.RESOLVED)
+
+    def test_final_commit_survives_concurrent_write(self):
+        def run(action_type, params):
+            # Another writer bumps the version while the actions run
+            other = self.db.get_incident(self.incident_id)
+            other.summary = "updated"
+            self.db.save_incident(other)
+            return {"ok": True}
+
+        with mock.patch.object(registry, "execute", side_effect=run):
+            executor.execute_plan(self.incident_id)
+
+        stored = self.db.get_incident(self.incident_id)
+        self.assertEqual(stored.state, IncidentState.RESOLVED)
+        self.assertEqual(stored.summary, "updated")
+        self.assertEqual([l["status"] for l in self._logs()], ["IN_PROGRESS", "SUCCESS", "IN_PROGRESS", "SUCCESS"])
+
+    def test_final_log_kept_when_incident_taken_over(self):
+        def run(action_type, params):
+            other = self.db.get_incident(self.incident_id)
+            other.state = IncidentState.FAILED
+            self.db.save_incident(other)
+            return {"ok": True}
+
+        with mock.patch.object(registry, "execute", side_effect=run):
+            executor.execute_plan(self.incident_id)
+
+        self.assertEqual(self.db.get_incident(self.incident_id).state, IncidentState.FAILED)
+        self.assertEqual(self._logs()[-1]["action_id"], "restart")
+
+    def test_crashed_claim_is_taken_over_after_lease(self):
+        with mock.patch.object(registry, "execute", side_effect=Crash):
+            with self.assertRaises(Crash):
+                executor.execute_plan(self.incident_id)
+        stuck = self.db.get_incident(self.incident_id)
+        self.assertEqual(stuck.state, IncidentState.EXECUTING)
+
+        runs = []
+        with mock.patch.object(registry, "execute", side_effect=lambda t, p: runs.append(t) or {"ok": True}):
+            # Within the lease the claim still counts as live
+            self.assertIsNone(executor.execute_plan(self.incident_id))
+            self.assertEqual(runs, [])
+
+            later = time.time() + executor.EXECUTION_LEASE_SECONDS + 1
+            with mock.patch.object(executor.time, "time", return_value=later):
+                result = executor.execute_plan(self.incident_id)
+
+        self.assertEqual(runs, ["scale_asg", "ssm_restart_service"])
+        self.assertEqual(result.state, IncidentState.RESOLVED)
+        self.assertNotEqual(result.claimed_by, stuck.claimed_by)
+        self.assertEqual(self.db.get_incident(self.incident_id).state, IncidentState.RESOLVED)
+
+    def test_force_reclaims_live_claim(self):
+        with mock.patch.object(registry, "execute", side_effect=Crash):
+            with self.assertRaises(Crash):
+                executor.execute_plan(self.incident_id)
+
+        with mock.patch.object(registry, "execute", return_value={"ok": True}):
+            result = executor.execute_plan(self.incident_id, force=True)
+        self.assertEqual(result.state, IncidentState.RESOLVED)
+
+    def test_superseded_executor_leaves_new_claim_alone(self):
+        runs = []
+
+        def run(action_type, params):
+            runs.append(action_type)
+            if len(runs) == 1:
+                # An operator force-reclaims while A is mid-plan; the new executor then dies
+                with self.assertRaises(Crash):
+                    executor.execute_plan(self.incident_id, force=True)
+            elif len(runs) == 2:
+                raise Crash
+            return {"ok": True}
+
+        with mock.patch.object(registry, "execute", side_effect=run):
+            executor.execute_plan(self.incident_id)
+
+        stored = self.db.get_incident(self.incident_id)
+        self.assertEqual(stored.state, IncidentState.EXECUTING)
+        self.assertEqual(self._logs()[-1]["status"], "SUCCESS")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,35 @@
+import os
+import tempfile
+import unittest
+from cli.import_time import measure, TARGETS
+from src.shared.lazy import LazyObject
+
+class TestStartup(unittest.TestCase):
+    def test_startup_stays_lazy(self):
+        # Deterministic guards only; the time budgets are checked by `rr import-time`
+        for target in TARGETS:
+            with self.subTest(target=target):
+                r = measure(target, runs=1)
+                self.assertEqual(r["heavy_imports"], [])
+                self.assertEqual(r["files_created"], [])
+
+class TestLazyStorage(unittest.TestCase):
+    def test_backend_built_on_first_use(self):
+        built = []
+
+        def factory():
+            from src.shared.storage import LocalStorage
+            built.append(LocalStorage(tmp))
+            return built[-1]
+
+        with tempfile.TemporaryDirectory() as tmp:
+            db = LazyObject(factory)
+            self.assertFalse(db.initialized)
+            self.assertEqual(os.listdir(tmp), [])
+            self.assertEqual(db.list_incidents(), [])
+            db.list_incidents()
+            self.assertEqual(len(built), 1)
+            self.assertTrue(db.initialized)
+
+if __name__ == '__main__':
+    unittest.main()
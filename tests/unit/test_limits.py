@@ -0,0 +1,94 @@
+import tempfile
+import unittest
+from src.shared import counters
+from src.shared.limits import BlastRadiusGuard
+from src.shared.storage import LocalStorage
+
+def _action(action_id="scale", action_type="scale_asg", **safety):
+    return {"id": action_id, "type": action_type, "params": {"asg_name": "app-prod-asg"}, "sanity_checks": safety}
+
+class TestRingCounter(unittest.TestCase):
+    def test_window_slides(self):
+        state = None
+        for t in (0, 10, 20):
+            allowed, state = counters.try_add(state, limit=3, window_seconds=60, now=t, buckets=6)
+            self.assertTrue(allowed)
+        allowed, _ = counters.try_add(state, limit=3, window_seconds=60, now=30, buckets=6)
+        self.assertFalse(allowed)
+        # t=0 has left the window by t=65, the others have not
+        allowed, state = counters.try_add(state, limit=3, window_seconds=60, now=65, buckets=6)
+        self.assertTrue(allowed)
+        self.assertEqual(state["total"], 3)
+
+    def test_long_gap_resets(self):
+        _, state = counters.try_add(None, limit=1, window_seconds=60, now=0)
+        allowed, state = counters.try_add(state, limit=1, window_seconds=60, now=10 ** 6)
+        self.assertTrue(allowed)
+        self.assertEqual(state["total"], 1)
+
+    def test_state_size_independent_of_history(self):
+        state = None
+        for t in range(10000):
+            _, state = counters.try_add(state, limit=10 ** 9, window_seconds=3600, now=t)
+        self.assertEqual(len(state["buckets"]), counters.DEFAULT_BUCKETS)
+
+class TestBlastRadiusGuard(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.guard = BlastRadiusGuard(LocalStorage(self.tmp.name))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_max_per_incident(self):
+        action = _action(max_per_incident=1)
+        self.assertIsNone(self.guard.reserve("inc-1", action, now=0))
+        self.assertIn("max_per_incident", self.guard.reserve("inc-1", action, now=1))
+        self.assertIsNone(self.guard.reserve("inc-2", action, now=2))
+
+    def test_max_global_window(self):
+        action = _action(max_global={"limit": 5, "window_seconds": 3600})
+        for n in range(5):
+            self.assertIsNone(self.guard.reserve(f"inc-{n}", action, now=n))
+        self.assertIn("max_global", self.guard.reserve("inc-6", action, now=10))
+        self.assertIsNone(self.guard.reserve("inc-7", action, now=3700))
+
+    def test_max_per_resource(self):
+        action = _action(max_per_resource={"limit": 1, "window_seconds": 600})
+        other = dict(action, params={"asg_name": "other-asg"})
+        self.assertIsNone(self.guard.reserve("inc-1", action, now=0))
+        self.assertIsNotNone(self.guard.reserve("inc-2", action, now=1))
+        self.assertIsNone(self.guard.reserve("inc-3", other, now=2))
+
+    def test_rejection_rolls_back_other_limits(self):
+        action = _action(max_per_incident=1, max_global={"limit": 1, "window_seconds": 3600})
+        self.assertIsNone(self.guard.reserve("inc-1", action, now=0))
+        # Global limit rejects; the per-incident slot for inc-2 must be given back
+        self.assertIsNotNone(self.guard.reserve("inc-2", action, now=1))
+        self.assertIsNone(self.guard.reserve("inc-2", action, now=3601))
+
+    def test_fan_out_counts_each_target(self):
+        action = {"id": "restart", "type": "ssm_restart_service",
+                  "params": {"instance_ids": ["i-1", "i-2", "i-3"], "service_name": "app"},
+                  "sanity_checks": {"max_per_resource": {"limit": 1, "window_seconds": 600},
+                                    "max_global": {"limit": 4, "window_seconds": 600}}}
+        self.assertIsNone(self.guard.reserve("inc-1", action, now=0))
+        # i-3 was already restarted in this window
+        overlap = dict(action, params={"instance_id": "i-4", "instance_ids": "i-3", "service_name": "app"})
+        self.assertIn("max_per_resource", self.guard.reserve("inc-2", overlap, now=1))
+        # 3 of 4 global slots are used: two more targets do not fit, one does
+        two = dict(action, params={"instance_ids": ["i-5", "i-6"], "service_name": "app"})
+        self.assertIn("max_global", self.guard.reserve("inc-3", two, now=2))
+        one = dict(action, params={"instance_ids": ["i-5"], "service_name": "app"})
+        self.assertIsNone(self.guard.reserve("inc-4", one, now=3))
+
+    def test_tag_selector_rejected_when_targets_are_counted(self):
+        action = {"id": "restart", "type": "ssm_restart_service",
+                  "params": {"targets": {"tags": {"app": "web"}}, "service_name": "app"},
+                  "sanity_checks": {"max_per_resource": {"limit": 3, "window_seconds": 600}}}
+        self.assertIn("tag selector", self.guard.reserve("inc-1", action, now=0))
+        uncounted = dict(action, sanity_checks={"max_per_incident": 1})
+        self.assertIsNone(self.guard.reserve("inc-1", uncounted, now=0))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,5 @@
 import unittest
-from src.shared.models import Runbook
+from src.shared.runbook_models import Runbook
 from src.planner.loader import find_matching_runbook
 
 class TestRunbookLoading(unittest.TestCase):
@@ -0,0 +1,70 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+from click.testing import CliRunner
+from src.shared.profiling import StageProfiler, profiler as global_profiler
+from alarm_events import SAMPLE_EVENT_FILE
+
+def _busy(n):
+    return sum(i * i for i in range(n))
+
+def _outer_work():
+    return _busy(20000)
+
+class TestStageProfiler(unittest.TestCase):
+    def test_disabled_is_noop(self):
+        profiler = StageProfiler()
+        with profiler.stage("ingest"):
+            _busy(10)
+        self.assertEqual(profiler.profiles, {})
+
+    def test_nested_stages_attribute_to_innermost(self):
+        profiler = StageProfiler()
+        profiler.start()
+        with profiler.stage("plan"):
+            _outer_work()
+            with profiler.stage("runbook_match"):
+                _busy(20000)
+        profiler.stop()
+
+        summary = profiler.summary()
+        self.assertEqual(set(summary), {"plan", "runbook_match"})
+        plan_funcs = [r["function"] for r in summary["plan"]["top"]]
+        match_funcs = [r["function"] for r in summary["runbook_match"]["top"]]
+        self.assertIn("test_profiling.py:_outer_work", plan_funcs)
+        self.assertNotIn("test_profiling.py:_outer_work", match_funcs)
+        self.assertFalse(any(f.startswith("profiling.py:") for f in plan_funcs))
+
+    def test_collapsed_stacks(self):
+        profiler = StageProfiler()
+        profiler.start()
+        with profiler.stage("execute"):
+            _outer_work()
+        profiler.stop()
+
+        lines = profiler.collapsed_stacks()
+        self.assertTrue(lines)
+        for line in lines:
+            path, value = line.rsplit(" ", 1)
+            self.assertTrue(path.startswith("execute;"))
+            self.assertGreaterEqual(int(value), 1)
+        self.assertTrue(any("test_profiling.py:_outer_work;test_profiling.py:_busy" in l for l in lines))
+
+        with tempfile.TemporaryDirectory() as out:
+            paths = profiler.write(out)
+            self.assertTrue(os.path.exists(paths["execute"]))
+            self.assertTrue(os.path.exists(paths["collapsed"]))
+
+    def test_simulate_writes_profile_when_incident_fails(self):
+        from cli.rr import cli
+        from src.simulation.orchestrator import orchestrator
+        with tempfile.TemporaryDirectory() as out, \
+                mock.patch.object(orchestrator, "process_event", side_effect=RuntimeError("boom")):
+            result = CliRunner().invoke(cli, ["simulate", SAMPLE_EVENT_FILE, "--profile", "--profile-out", out])
+            self.assertIn("boom", result.output)
+            self.assertFalse(global_profiler.enabled)
+            self.assertTrue(os.path.exists(os.path.join(out, "stacks.collapsed")))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import sys
+import unittest
+from unittest import mock
+from pydantic import ValidationError
+from src.actions.registry import ActionRegistry, registry
+from src.shared.runbook_models import Runbook
+
+def _runbook(action_type, params):
+    return {
+        "runbook_id": "rb",
+        "match": {"alarm_name_prefix": "x"},
+        "actions": [{"id": "a1", "type": action_type, "params": params}],
+    }
+
+class TestRunbookValidation(unittest.TestCase):
+    def test_unknown_action_fails_at_load(self):
+        with self.assertRaises(ValidationError) as ctx:
+            Runbook(**_runbook("reboot_universe", {}))
+        self.assertIn("unknown action type 'reboot_universe'", str(ctx.exception))
+
+    def test_bad_params_fail_at_load(self):
+        with self.assertRaises(ValidationError) as ctx:
+            Runbook(**_runbook("scale_asg", {"asg": "x", "adjustment": "lots"}))
+        message = str(ctx.exception)
+        self.assertIn("unknown param 'asg'", message)
+        self.assertIn("missing required param 'asg_name'", message)
+        self.assertIn("param 'adjustment' must be int", message)
+
+    def test_templates_and_one_of(self):
+        Runbook(**_runbook("scale_asg", {"asg_name": "${dimensions.AutoScalingGroupName}", "adjustment": 1}))
+        errors = registry.validate("ssm_restart_service", {"service_name": "nginx"})
+        self.assertEqual(errors, ["ssm_restart_service: needs one of instance_id, instance_ids, targets"])
+
+class TestLazyDispatch(unittest.TestCase):
+    def test_module_imported_on_first_use(self):
+        sys.modules.pop("colorsys", None)
+        reg = ActionRegistry({"to_hsv": {"target": "colorsys:rgb_to_hsv", "params": {}}})
+        self.assertEqual(reg.validate("to_hsv", {}), [])
+        self.assertNotIn("colorsys", sys.modules)
+        fn = reg.get("to_hsv")
+        self.assertIn("colorsys", sys.modules)
+        self.assertIs(reg.get("to_hsv"), fn)
+
+    def test_unknown_action_at_execute(self):
+        reg = ActionRegistry({})
+        with self.assertRaises(NotImplementedError):
+            reg.execute("nope", {})
+
+class TestPluginSchemas(unittest.TestCase):
+    def _plugin(self, specs):
+        ep = mock.Mock()
+        ep.name = "acme"
+        ep.load.return_value = specs
+        return mock.patch("importlib.metadata.entry_points", return_value=[ep])
+
+    def test_plugin_actions_are_validated(self):
+        reg = ActionRegistry({})
+        with self._plugin({"page_oncall": {"target": "acme:page", "params": {"team": {"type": "str"}}}}):
+            self.assertEqual(reg.validate("page_oncall", {"team": 1}), ["page_oncall: param 'team' must be str"])
+
+    def test_unknown_param_type_names_the_action(self):
+        reg = ActionRegistry({})
+        with self._plugin({"page_oncall": {"target": "acme:page", "params": {"delay": {"type": ["int", "float"]}}}}):
+            with self.assertRaisesRegex(ValueError, r"plugin 'acme': action 'page_oncall' param 'delay' .*'float'"):
+                reg.validate("page_oncall", {"delay": 1.5})
+            # Not half-registered: it fails the same way next time
+            with self.assertRaises(ValueError):
+                reg.spec("page_oncall")
+
+    def test_manifest_types_checked(self):
+        with self.assertRaisesRegex(ValueError, r"action 'x' param 'n' declares unknown type 'float'"):
+            ActionRegistry({"x": {"target": "m:f", "params": {"n": {"type": "float"}}}})
+
+if __name__ == '__main__':
+    unittest.main()
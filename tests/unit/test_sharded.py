@@ -0,0 +1,77 @@
+import json
+import multiprocessing
+import os
+import tempfile
+import unittest
+from collections import Counter
+from unittest import mock
+from src.shared.storage import SQLiteStorage
+from src.simulation import sharded
+from src.simulation.sharded import resource_key, shard_for, run_sharded
+from alarm_events import RUNBOOKS_DIR, alarm_event
+
+def _event(n, dimensions, state=None):
+    return alarm_event(event_id=f"evt-{n}", dimensions=dimensions, state=state)
+
+class TestSharding(unittest.TestCase):
+    def test_resource_key(self):
+        self.assertEqual(resource_key(_event(0, {"AutoScalingGroupName": "asg-1"})), "AutoScalingGroupName=asg-1")
+        self.assertEqual(resource_key(_event(0, {"InstanceId": "i-1"})), "InstanceId=i-1")
+        self.assertEqual(resource_key(_event(0, {})), "alarm=ec2-high-cpu-prod")
+
+    def test_shard_is_stable(self):
+        shards = {shard_for(f"InstanceId=i-{n}", 4) for n in range(100)}
+        self.assertEqual(shards, {0, 1, 2, 3})
+        self.assertEqual(shard_for("InstanceId=i-7", 4), shard_for("InstanceId=i-7", 4))
+
+    def test_pipeline_shares_limits_across_shards(self):
+        # 30 distinct ASGs that exist in the mock, so the events spread over both shards
+        events = [_event(n, {"AutoScalingGroupName": f"fleet-asg-{n:03d}"}) for n in range(30)]
+        events.append(_event(30, {"AutoScalingGroupName": "fleet-asg-000"}, state="OK"))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "ranger.sqlite")
+            report = run_sharded((json.dumps(e) for e in events), shards=2, db_path=path,
+                                 runbooks_dir=RUNBOOKS_DIR, auto_approve=True)
+            db = SQLiteStorage(path)
+            scale_ups = Counter(a["status"] for a in db.iter_action_items() if a["action_id"] == "scale_asg_up")
+            skip_reasons = {a["details"]["reason"] for a in db.iter_action_items()
+                            if a["action_id"] == "scale_asg_up" and a["status"] == "SKIPPED"}
+            incidents = db.list_incidents()
+
+        self.assertEqual(report["events"], 31)
+        self.assertEqual(sum(report["outcomes"].values()), 31)
+        self.assertEqual(report["outcomes"]["ignored"], 1)
+        self.assertEqual(len(incidents), 30)
+        self.assertEqual(sum(s["events"] for s in report["per_shard"]), 31)
+        self.assertTrue(all(s["events"] for s in report["per_shard"]))
+        self.assertEqual(report["latency_ms"]["total"]["count"], 30)
+        # The runbook allows 5 scale-ups per hour fleet-wide, however many workers race for them:
+        # exactly 5 incidents reserve a slot and scale, the other 25 are skipped by the limit
+        self.assertEqual(scale_ups["IN_PROGRESS"], 5)
+        self.assertEqual(scale_ups["SUCCESS"], 5)
+        self.assertEqual(scale_ups["SKIPPED"], 25)
+        self.assertEqual(len(skip_reasons), 1)
+        self.assertIn("max_global exceeded", skip_reasons.pop())
+
+class TestWorkerLiveness(unittest.TestCase):
+    def setUp(self):
+        self.ctx = multiprocessing.get_context("spawn")
+        self.dead = self.ctx.Process(target=os._exit, args=(3,))
+        self.dead.start()
+        self.dead.join()
+        patch = mock.patch.object(sharded, "LIVENESS_POLL_SECONDS", 0.05)
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def test_receive_fails_when_worker_dies(self):
+        with self.assertRaisesRegex(RuntimeError, "shard 0 exited with code 3"):
+            sharded._receive(self.ctx.Queue(), [self.dead])
+
+    def test_send_fails_when_dead_worker_queue_is_full(self):
+        inbox = self.ctx.Queue(1)
+        inbox.put(["already queued"])
+        with self.assertRaisesRegex(RuntimeError, "shard 0 exited with code 3"):
+            sharded._send(inbox, ["line"], 0, self.dead)
+
+if __name__ == '__main__':
+    unittest.main()
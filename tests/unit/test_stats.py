@@ -0,0 +1,109 @@
+import json
+import math
+import unittest
+from unittest import mock
+from click.testing import CliRunner
+from cli.rr import cli
+from src.analytics.stats import StatsFrame, to_epoch, UNMATCHED
+
+class FakeStorage:
+    def __init__(self, incidents, actions):
+        self.incidents, self.actions = incidents, actions
+
+    def iter_incident_items(self):
+        return iter(self.incidents)
+
+    def iter_action_items(self):
+        return iter(self.actions)
+
+def _incident(n, state, runbook="rb-cpu", created="2026-01-01T00:00:00", resolved=None):
+    return {"incident_id": f"inc-{n}", "alarm_name": "cpu", "state": state, "runbook_id": runbook,
+            "created_at": created, "resolved_at": resolved}
+
+def _log(n, action, status, ts, step=None):
+    return {"incident_id": f"inc-{n}", "action_id": step or f"{action}_step", "action_type": action,
+            "status": status, "timestamp": ts}
+
+INCIDENTS = [
+    _incident(1, "RESOLVED", resolved="2026-01-01T00:10:00Z"),
+    _incident(2, "RESOLVED", created="2026-01-01T01:00:00", resolved="2026-01-01T01:20:00Z"),
+    _incident(3, "FAILED", created="2026-01-01T02:30:00"),
+    _incident(4, "OPEN", runbook=None, created="2026-01-02T00:00:00"),
+]
+ACTIONS = [
+    _log(1, "scale_asg", "IN_PROGRESS", "2026-01-01T00:00:01"),
+    _log(1, "scale_asg", "SUCCESS", "2026-01-01T00:00:06"),
+    _log(2, "scale_asg", "IN_PROGRESS", "2026-01-01T01:00:01"),
+    _log(2, "scale_asg", "SUCCESS", "2026-01-01T01:00:16"),
+    _log(3, "scale_asg", "SKIPPED", "2026-01-01T02:30:01"),
+    _log(99, "scale_asg", "SUCCESS", "2026-01-01T02:30:01"),  # orphan log, ignored
+]
+
+class TestStats(unittest.TestCase):
+    def setUp(self):
+        self.frame = StatsFrame.from_storage(FakeStorage(INCIDENTS, ACTIONS))
+
+    def test_to_epoch(self):
+        out = to_epoch(["1970-01-01T00:01:00Z", None, "1970-01-01T00:00:00.5"])
+        self.assertEqual(out[0], 60)
+        self.assertTrue(math.isnan(out[1]))
+        self.assertEqual(out[2], 0.5)
+
+    def test_mttr_and_success(self):
+        res = self.frame.compute()
+        self.assertEqual(res["incidents"], {"total": 4, "resolved": 2, "failed": 1, "unfinished": 1})
+        self.assertEqual(res["mttr_minutes"]["count"], 2)
+        self.assertEqual(res["mttr_minutes"]["mean"], 15.0)
+        self.assertEqual(res["runbooks"]["rb-cpu"]["success_rate"], round(2 / 3, 4))
+        self.assertIsNone(res["runbooks"][UNMATCHED]["success_rate"])
+
+    def test_action_latency(self):
+        scale = self.frame.compute()["actions"]["scale_asg"]
+        self.assertEqual(scale["runs"], 3)
+        self.assertEqual(scale["success_rate"], round(2 / 3, 4))
+        self.assertEqual(scale["latency_seconds"]["count"], 2)
+        self.assertEqual(scale["latency_seconds"]["mean"], 10.0)
+
+    def test_filters_and_buckets(self):
+        res = self.frame.compute(since="2026-01-01T00:30:00", until="2026-01-02T00:00:00")
+        self.assertEqual(res["incidents"]["total"], 2)
+        self.assertEqual(res["actions"]["scale_asg"]["runs"], 2)
+        self.assertEqual([b["count"] for b in res["incident_rate"]["buckets"]], [1, 1])
+
+        res = self.frame.compute(runbook="nope")
+        self.assertEqual(res["incidents"]["total"], 0)
+        self.assertEqual(res["mttr_minutes"], {"count": 0})
+
+    def test_same_type_steps_are_separate_runs(self):
+        # One runbook scaling twice: each step is its own run, not one run spanning both
+        logs = [
+            _log(1, "scale_asg", "IN_PROGRESS", "2026-01-01T00:00:00", step="scale_up"),
+            _log(1, "scale_asg", "SUCCESS", "2026-01-01T00:00:02", step="scale_up"),
+            _log(1, "scale_asg", "IN_PROGRESS", "2026-01-01T00:05:00", step="scale_up_again"),
+            _log(1, "scale_asg", "FAILED", "2026-01-01T00:05:04", step="scale_up_again"),
+        ]
+        scale = StatsFrame.from_storage(FakeStorage(INCIDENTS[:1], logs)).compute()["actions"]["scale_asg"]
+        self.assertEqual(scale["runs"], 2)
+        self.assertEqual(scale["success_rate"], 0.5)
+        self.assertEqual(scale["latency_seconds"]["mean"], 3.0)
+        self.assertEqual(scale["latency_seconds"]["max"], 4.0)
+
+class TestStatsCommand(unittest.TestCase):
+    def _invoke(self, *args):
+        with mock.patch("src.shared.storage.db", FakeStorage([_incident(1, "RESOLVED")], [])):
+            return CliRunner().invoke(cli, ["stats", *args])
+
+    def test_bucket_values(self):
+        for bucket, seconds in (("hour", 3600), ("day", 86400), ("900", 900)):
+            result = self._invoke("--bucket", bucket)
+            self.assertEqual(result.exit_code, 0, result.output)
+            self.assertEqual(json.loads(result.output)["incident_rate"]["bucket_seconds"], seconds)
+
+    def test_bad_bucket_is_a_usage_error(self):
+        for bucket in ("week", "0", "-60", "1.5"):
+            result = self._invoke("--bucket", bucket)
+            self.assertEqual(result.exit_code, 2, bucket)
+            self.assertIn("Invalid value for '--bucket'", result.output)
+
+if __name__ == '__main__':
+    unittest.main()
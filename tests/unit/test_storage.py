@@ -0,0 +1,235 @@
+import copy
+import json
+import multiprocessing
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+import boto3
+from moto import mock_aws
+from src.shared.models import Incident, IncidentState, RemediationPlan, ActionLog, ActionStatus
+from src.shared.storage import LocalStorage, SQLiteStorage, DynamoDBStorage, StateConflictError
+from src.shared import event_blobs
+from alarm_events import alarm_event
+
+def _event(event_id, reason):
+    return alarm_event(event_id=event_id, reason=reason)
+
+class TestEventBlobs(unittest.TestCase):
+    def test_split_merge_roundtrip(self):
+        event = _event("a", "reason a")
+        stable, envelope = event_blobs.split_event(event)
+        self.assertNotIn("id", stable)
+        self.assertNotIn("state", stable["detail"])
+        self.assertEqual(event_blobs.merge_event(stable, envelope), event)
+
+    def test_hash_ignores_key_order(self):
+        self.assertEqual(event_blobs.content_hash({"a": 1, "b": 2}), event_blobs.content_hash({"b": 2, "a": 1}))
+
+class TestLocalEventStorage(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = LocalStorage(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _incident(self, event):
+        return Incident(alarm_name="ec2-high-cpu-prod", summary="x", cloudwatch_event=copy.deepcopy(event))
+
+    def test_repeated_alarms_share_one_blob(self):
+        events = [_event(f"id-{n}", f"datapoint {n}") for n in range(5)]
+        incidents = [self._incident(e) for e in events]
+        for inc in incidents:
+            self.db.save_incident(inc)
+
+        self.assertEqual(len(os.listdir(self.db.events_dir)), 1)
+        self.assertEqual(len({inc.event_ref for inc in incidents}), 1)
+
+        for inc, event in zip(incidents, events):
+            self.assertEqual(self.db.get_incident(inc.incident_id).cloudwatch_event, {})
+            loaded = self.db.get_incident(inc.incident_id, include_event=True)
+            self.assertEqual(loaded.cloudwatch_event, event)
+
+    def test_resave_keeps_event(self):
+        event = _event("id-1", "r")
+        inc = self._incident(event)
+        self.db.save_incident(inc)
+        loaded = self.db.get_incident(inc.incident_id)
+        loaded.summary = "updated"
+        self.db.save_incident(loaded)
+        self.assertEqual(self.db.get_event(self.db.get_incident(inc.incident_id)), event)
+
+    def test_legacy_inline_event(self):
+        event = _event("id-1", "r")
+        inc = self._incident(event)
+        with open(self.db.incidents_file, 'w') as f:
+            json.dump({inc.incident_id: inc.model_dump()}, f)
+        self.assertEqual(self.db.get_incident(inc.incident_id, include_event=True).cloudwatch_event, event)
+
+class TransactionTests:
+    """Shared unit-of-work behaviour; subclasses provide self.db."""
+
+    def _new_incident(self):
+        inc = Incident(alarm_name="ec2-high-cpu-prod", summary="x", cloudwatch_event=_event("id-1", "r"))
+        self.db.save_incident(inc)
+        return inc
+
+    def test_plan_and_state_commit_together(self):
+        inc = self._new_incident()
+        inc.state = IncidentState.MITIGATING
+        with self.db.transaction() as tx:
+            tx.save_plan(RemediationPlan(incident_id=inc.incident_id, actions=[{"id": "a"}]))
+            tx.save_incident(inc, expected_state=IncidentState.OPEN)
+
+        stored = self.db.get_incident(inc.incident_id)
+        self.assertEqual(stored.state, IncidentState.MITIGATING)
+        self.assertEqual(stored.version, 2)
+        self.assertEqual(inc.version, 2)
+        self.assertEqual(self.db.get_plan(inc.incident_id).actions, [{"id": "a"}])
+
+    def test_lost_update_is_rejected_atomically(self):
+        inc = self._new_incident()
+        first = self.db.get_incident(inc.incident_id)
+        second = self.db.get_incident(inc.incident_id)
+
+        first.state = IncidentState.MITIGATING
+        self.db.save_incident(first)
+
+        second.state = IncidentState.FAILED
+        with self.assertRaises(StateConflictError):
+            with self.db.transaction() as tx:
+                tx.log_action(ActionLog(incident_id=inc.incident_id, action_id="a", status=ActionStatus.FAILED))
+                tx.save_incident(second)
+        self.assertEqual(self.db.get_incident(inc.incident_id).state, IncidentState.MITIGATING)
+        self.assertEqual(self._action_logs(inc.incident_id), [])
+
+    def test_expected_state(self):
+        inc = self._new_incident()
+        inc.state = IncidentState.RESOLVED
+        with self.assertRaises(StateConflictError):
+            self.db.save_incident(inc, expected_state=IncidentState.MITIGATING)
+        self.db.save_incident(inc, expected_state=IncidentState.OPEN)
+        self.assertEqual(self.db.get_incident(inc.incident_id).state, IncidentState.RESOLVED)
+
+    def test_event_roundtrip(self):
+        inc = self._new_incident()
+        loaded = self.db.get_incident(inc.incident_id, include_event=True)
+        self.assertEqual(loaded.cloudwatch_event, _event("id-1", "r"))
+
+    def test_counters(self):
+        self.assertTrue(self.db.increment_counter("k", limit=1))
+        self.assertFalse(self.db.increment_counter("k", limit=1))
+        self.assertTrue(self.db.increment_counter("w", limit=2, window_seconds=60, now=0))
+        self.assertTrue(self.db.increment_counter("w", limit=2, window_seconds=60, now=1))
+        self.assertFalse(self.db.increment_counter("w", limit=2, window_seconds=60, now=2))
+        self.assertTrue(self.db.increment_counter("w", limit=2, window_seconds=60, now=120))
+
+    def test_increment_counters_all_or_nothing(self):
+        requests = [("plain", 2, None, 1), ("window", 3, 60, 2)]
+        self.assertIsNone(self.db.increment_counters(requests, now=0))
+        # The window has 1 slot left: the batch is rejected at index 1 and "plain" stays at 1
+        self.assertEqual(self.db.increment_counters(requests, now=1), 1)
+        self.assertTrue(self.db.increment_counter("plain", limit=2))
+        self.assertEqual(self.db.increment_counters([("window", 3, 60, 1), ("plain", 2, None, 1)], now=2), 1)
+        self.assertTrue(self.db.increment_counter("window", limit=3, window_seconds=60, now=3))
+
+class TestLocalTransactions(TransactionTests, unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = LocalStorage(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _action_logs(self, incident_id):
+        with open(self.db.actions_file) as f:
+            return json.load(f).get(incident_id, [])
+
+    def test_counter_check_ignores_other_counters(self):
+        self.assertTrue(self.db.increment_counter("global", limit=10 ** 6))
+        size = os.path.getsize(self.db._counter_path("global"))
+        for n in range(200):
+            self.db.increment_counter(f"incident#{n}#scale", limit=1)
+        self.assertTrue(self.db.increment_counter("global", limit=10 ** 6))
+        self.assertEqual(os.path.getsize(self.db._counter_path("global")), size)
+
+def _bump(path, n):
+    db = SQLiteStorage(path)
+    return sum(db.increment_counter("global", limit=50) for _ in range(n))
+
+class TestSQLiteTransactions(TransactionTests, unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "ranger.sqlite")
+        self.db = SQLiteStorage(self.path)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _action_logs(self, incident_id):
+        return [a for a in self.db.iter_action_items() if a["incident_id"] == incident_id]
+
+    def test_counter_limit_holds_across_processes(self):
+        with multiprocessing.get_context("spawn").Pool(4) as pool:
+            granted = pool.starmap(_bump, [(self.path, 30)] * 4)
+        self.assertEqual(sum(granted), 50)
+
+    def test_list_keeps_creation_order(self):
+        first, second = self._new_incident(), self._new_incident()
+        first.state = IncidentState.RESOLVED
+        self.db.save_incident(first)
+        self.assertEqual([i.incident_id for i in self.db.list_incidents()], [first.incident_id, second.incident_id])
+
+    def test_counters_do_not_wait_for_state_writes(self):
+        other = SQLiteStorage(self.path)  # another writer, with its own connections
+        with mock.patch("src.shared.storage.SQLITE_BUSY_TIMEOUT_SECONDS", 0.05):
+            with self.db._write():
+                # Holding the incident/plan/action write lock does not block a reservation
+                self.assertTrue(other.increment_counter("global", limit=1))
+                with self.assertRaises(sqlite3.OperationalError):
+                    other.save_incident(Incident(alarm_name="ec2-high-cpu-prod", summary="x"))
+
+class TestDynamoDBTransactions(TransactionTests, unittest.TestCase):
+    """Runs against moto's in-process DynamoDB."""
+    TABLES = {
+        "Incidents": [("incident_id", "HASH")],
+        "Plans": [("incident_id", "HASH"), ("plan_version", "RANGE")],
+        "ActionLogs": [("incident_id", "HASH"), ("ts_action_id", "RANGE")],
+        "EventBlobs": [("event_hash", "HASH")],
+        "Counters": [("counter_key", "HASH")],
+    }
+
+    def setUp(self):
+        self.env = mock.patch.dict(os.environ, {
+            "AWS_DEFAULT_REGION": "us-east-1", "AWS_ACCESS_KEY_ID": "testing", "AWS_SECRET_ACCESS_KEY": "testing"})
+        self.env.start()
+        self.aws = mock_aws()
+        self.aws.start()
+        ddb = boto3.client("dynamodb")
+        for name, keys in self.TABLES.items():
+            ddb.create_table(
+                TableName=name,
+                KeySchema=[{"AttributeName": k, "KeyType": t} for k, t in keys],
+                AttributeDefinitions=[{"AttributeName": k, "AttributeType": "S"} for k, _ in keys],
+                BillingMode="PAY_PER_REQUEST"
+            )
+        self.db = DynamoDBStorage()
+
+    def tearDown(self):
+        self.aws.stop()
+        self.env.stop()
+
+    def _action_logs(self, incident_id):
+        return self.db.table_actions.query(
+            KeyConditionExpression="incident_id = :id",
+            ExpressionAttributeValues={":id": incident_id})["Items"]
+
+    def test_repeated_alarms_share_one_blob(self):
+        for n in range(3):
+            self.db.save_incident(Incident(alarm_name="a", summary="x", cloudwatch_event=_event(f"id-{n}", "r")))
+        self.assertEqual(self.db.table_events.scan()["Count"], 1)
+
+if __name__ == '__main__':
+    unittest.main()